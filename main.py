@@ -1,9 +1,57 @@
-from src.gui import MainWindow
-from PySide6.QtWidgets import QApplication
+# Imported first: startup times are measured from here
+from src.startup import STARTUP
+import argparse
+import json
 import sys
+import multiprocessing
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Invisible Mouse - hand and voice control")
+    parser.add_argument("--headless", action="store_true", help="Run as a background service without the GUI")
+    parser.add_argument("--voice", action="store_true", help="Enable voice control in headless mode")
+    parser.add_argument("--control", help="Control socket path, or HOST:PORT (default: per-user socket)")
+    parser.add_argument("--ctl", metavar="COMMAND", help="Send a command to a running headless instance and exit")
+    parser.add_argument("--startup-report", action="store_true", help="Print startup milestones as they are reached")
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
+    # Needed for the inference process in PyInstaller builds
+    multiprocessing.freeze_support()
+    args = parse_args()
+    STARTUP.verbose = args.startup_report
+    if args.ctl:
+        from src.control import send_command, parse_address, default_control_address
+        address = parse_address(args.control) or default_control_address()
+        try:
+            reply = send_command(args.ctl, address)
+        except OSError:
+            if not isinstance(address, str):
+                address = f"{address[0]}:{address[1]}"
+            print(f"no headless instance running at {address}")
+            sys.exit(1)
+        print(json.dumps(reply, indent=2))
+        sys.exit(0)
+    if args.headless:
+        # The GUI toolkit is never imported in headless mode
+        from src.daemon import Daemon
+        from src.control import parse_address
+        address = parse_address(args.control)
+        try:
+            daemon = Daemon(control_address=address, voice=args.voice)
+            daemon.run()
+        except RuntimeError as e:
+            print(e)
+            sys.exit(1)
+        sys.exit(0)
+    from src.gui import MainWindow
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import QTimer
+    STARTUP.mark("gui imported")
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
-    sys.exit(app.exec()) 
\ No newline at end of file
+    # Runs once the event loop has painted the window
+    QTimer.singleShot(0, lambda: STARTUP.mark("window shown"))
+    sys.exit(app.exec())
@@ -0,0 +1,241 @@
+"""
+Headless benchmarks.
+
+    python -m src.benchmark gesture SESSION.lmk [--speed 1.0] [--trace out.json]
+    python -m src.benchmark gesture --synthetic 3000
+    python -m src.benchmark e2e VIDEO [--resolutions 640x480,1280x720] [--realtime]
+
+The gesture benchmark replays a landmark recording (or a synthetic session)
+through GestureController with a RecordingBackend, so it needs neither a
+camera nor a display. The e2e benchmark runs the full HandTracker ->
+GestureController path on frames from a video file, image directory or
+"synthetic", still with a RecordingBackend for output.
+"""
+import argparse
+import contextlib
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+from src.features import HandFeatures, NUM_LANDMARKS, THUMB_TIP, INDEX_TIP, MIDDLE_TIP
+from src.gesture_controller import GestureController
+from src.input_backend import RecordingBackend
+from src.recording import LandmarkReplayer, read_session
+from src.metrics import percentile
+
+
+def synthetic_session(frames=3000, fps=30.0, seed=0):
+    """
+    Scripted hand that circles the screen, pinches for a drag every few
+    seconds and does two-finger scrolls, with a short loss of tracking.
+    """
+    rng = np.random.default_rng(seed)
+    base = rng.uniform(-0.05, 0.05, size=(NUM_LANDMARKS, 3)).astype(np.float32)
+    session = []
+    for i in range(frames):
+        t = i / fps
+        if i % 300 >= 290:
+            session.append((t, np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32)))
+            continue
+        hand = base.copy()
+        cx = 0.5 + 0.3 * math.cos(t * 0.8)
+        cy = 0.5 + 0.3 * math.sin(t * 0.8)
+        hand[:, 0] += cx
+        hand[:, 1] += cy
+        hand[:, :2] += rng.normal(0.0, 0.002, size=(NUM_LANDMARKS, 2))
+        phase = i % 150
+        if 40 <= phase < 70:
+            hand[INDEX_TIP, :2] = hand[THUMB_TIP, :2] + 0.01
+        elif 100 <= phase < 110:
+            hand[MIDDLE_TIP, :2] = hand[THUMB_TIP, :2] + 0.01
+        elif 120 <= phase < 140:
+            offset = 0.05 * (phase - 120)
+            hand[INDEX_TIP, 1] += offset
+            hand[MIDDLE_TIP, 1] += offset
+        session.append((t, hand[np.newaxis]))
+    return session
+
+
+@contextlib.contextmanager
+def quiet():
+    """
+    Sends the controllers' event prints to a null sink, so they neither
+    cost time in the measured loop nor mix with the JSON on stdout.
+    """
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        yield
+
+
+def bench_gesture(frames, speed=None, screen_size=(1920, 1080)):
+    """
+    Replays frames through a fresh GestureController. Returns throughput,
+    allocation figures and the emitted event trace.
+    """
+    def make_controller():
+        backend = RecordingBackend(screen_size=screen_size)
+        return GestureController(backend=backend), backend
+
+    # Timing pass
+    controller, backend = make_controller()
+    replayer = LandmarkReplayer(frames, speed=speed)
+    with quiet():
+        start = time.perf_counter()
+        count = replayer.play(controller)
+        elapsed = time.perf_counter() - start
+
+    # Allocation pass; tracemalloc slows execution so it is kept separate.
+    # Memory allocated and freed again within a frame shows up as the
+    # frame's peak above the memory in use when it started.
+    controller, _ = make_controller()
+    replayer = LandmarkReplayer(frames, speed=None)
+    transient = []
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    in_use = tracemalloc.get_traced_memory()[0]
+
+    def on_frame(timestamp, landmarks):
+        nonlocal in_use
+        current, frame_peak = tracemalloc.get_traced_memory()
+        transient.append(frame_peak - in_use)
+        in_use = current
+        tracemalloc.reset_peak()
+
+    with quiet():
+        replayer.play(controller, on_frame=on_frame)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks_after = sys.getallocatedblocks()
+
+    mean_latency, max_latency = backend.latency_stats()
+    return {
+        "frames": count,
+        "seconds": elapsed,
+        "frames_per_second": count / elapsed if elapsed > 0 else 0.0,
+        "us_per_frame": 1e6 * elapsed / count if count else 0.0,
+        # Blocks still allocated at the end; freed allocations don't count
+        "net_blocks_per_frame": (blocks_after - blocks_before) / count if count else 0.0,
+        "transient_bytes_per_frame": {
+            "mean": sum(transient) / len(transient) if transient else 0.0,
+            "max": max(transient, default=0),
+        },
+        "peak_traced_bytes": peak,
+        "events": len(backend.events),
+        "coalesced_moves": backend.coalesced_moves,
+        "injection_latency_ms": {"mean": mean_latency, "max": max_latency},
+        "trace": backend.events,
+    }
+
+
+def parse_resolution(text):
+    width, _, height = text.lower().partition("x")
+    return int(width), int(height)
+
+
+def bench_end_to_end(spec, resolution, frames=300, realtime=False, inference_size=None, motion_gate=False):
+    """
+    Runs frames from spec at resolution through HandTracker and
+    GestureController on one thread. Latency is measured from each frame's
+    capture timestamp to the end of gesture processing. motion_gate runs
+    the tracker with a MotionGate and reports how many frames it skipped.
+    """
+    from src.frame_sources import SyntheticSource, ImageDirectorySource, VideoFileSource
+    from src.hand_tracker import HandTracker
+    from src.motion_gate import MotionGate
+    if spec == "synthetic":
+        source = SyntheticSource(resolution, fps=30.0 if realtime else 0.0, frames=frames)
+    elif os.path.isdir(spec):
+        source = ImageDirectorySource(spec, resolution, loop=True)
+    else:
+        source = VideoFileSource(spec, resolution, loop=True, realtime=realtime)
+    width, height = resolution
+    gate = MotionGate() if motion_gate else None
+    tracker = HandTracker(frame_width=width, frame_height=height, inference_size=inference_size, source=source,
+                          motion_gate=gate)
+    backend = RecordingBackend()
+    controller = GestureController(backend=backend)
+    features = HandFeatures(tracker.max_num_hands)
+    latencies = []
+    detected = 0
+    try:
+        with quiet():
+            start = time.perf_counter()
+            for _ in range(frames):
+                frame = tracker.read_frame()
+                if frame is None:
+                    break
+                capture_time = tracker.last_capture_time
+                landmarks = tracker.process_frame(frame)
+                if len(landmarks):
+                    detected += 1
+                    features.update(landmarks)
+                    controller.process_hand(landmarks[0], features, 0, capture_time)
+                else:
+                    controller.release_drag()
+                latencies.append(time.monotonic() - capture_time)
+            elapsed = time.perf_counter() - start
+    finally:
+        tracker.release()
+    latencies.sort()
+    count = len(latencies)
+    result = {
+        "resolution": f"{width}x{height}",
+        "frames": count,
+        "frames_with_hand": detected,
+        "frames_per_second": count / elapsed if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "p50": 1000.0 * percentile(latencies, 50),
+            "p95": 1000.0 * percentile(latencies, 95),
+            "p99": 1000.0 * percentile(latencies, 99),
+            "max": 1000.0 * latencies[-1] if latencies else 0.0,
+        },
+        "events": len(backend.events),
+    }
+    if gate is not None:
+        result["motion_gate_skip_rate"] = gate.skip_rate
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Invisible Mouse headless benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+    gesture = sub.add_parser("gesture", help="Replay landmarks through GestureController")
+    gesture.add_argument("session", nargs="?", help="Landmark recording (.lmk)")
+    gesture.add_argument("--synthetic", type=int, metavar="FRAMES", help="Use a synthetic session instead")
+    gesture.add_argument("--speed", type=float, default=None, help="Playback rate, 1.0 = real time (default: max)")
+    gesture.add_argument("--trace", help="Write the emitted event trace to this JSON file")
+    e2e = sub.add_parser("e2e", help="Run the full vision pipeline on a video, image directory or 'synthetic'")
+    e2e.add_argument("source", help="Video file, image directory or 'synthetic'")
+    e2e.add_argument("--resolutions", default="640x480,1280x720", help="Comma-separated WIDTHxHEIGHT list")
+    e2e.add_argument("--frames", type=int, default=300, help="Frames per resolution")
+    e2e.add_argument("--realtime", action="store_true", help="Pace frames at the source frame rate")
+    e2e.add_argument("--inference-size", type=int, default=None, help="HandTracker inference_size")
+    e2e.add_argument("--motion-gate", action="store_true", help="Reuse landmarks on static frames")
+    args = parser.parse_args(argv)
+
+    if args.command == "gesture":
+        if args.synthetic:
+            frames = synthetic_session(args.synthetic)
+        elif args.session:
+            frames = read_session(args.session)
+        else:
+            parser.error("gesture needs a session file or --synthetic")
+        result = bench_gesture(frames, speed=args.speed)
+        trace = result.pop("trace")
+        if args.trace:
+            with open(args.trace, "w") as f:
+                json.dump(trace, f)
+        print(json.dumps(result, indent=2))
+    elif args.command == "e2e":
+        results = [
+            bench_end_to_end(args.source, parse_resolution(res), args.frames, args.realtime, args.inference_size,
+                             args.motion_gate)
+            for res in args.resolutions.split(",")
+        ]
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import os
+import time
+import cv2
+
+FOURCCS = ("MJPG", "YUYV")
+FRAME_RATES = (60, 30)
+WARMUP_FRAMES = 5
+SAMPLE_FRAMES = 20
+
+
+class CaptureProfile:
+    """
+    A camera mode (resolution, pixel format, requested FPS) together with
+    what the probe measured for it: delivered FPS, how many stale frames the
+    driver buffers (drain) and the resulting capture latency estimate.
+    """
+
+    def __init__(self, width, height, fourcc, fps, measured_fps=0.0, drain=0, latency_ms=0.0):
+        self.width = width
+        self.height = height
+        self.fourcc = fourcc
+        self.fps = fps
+        self.measured_fps = measured_fps
+        self.drain = drain
+        self.latency_ms = latency_ms
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+    def __repr__(self):
+        return (f"CaptureProfile({self.width}x{self.height} {self.fourcc} @{self.fps}: "
+                f"{self.measured_fps:.1f} fps, drain {self.drain}, {self.latency_ms:.0f} ms)")
+
+
+def apply_profile(cap, profile):
+    """Puts cap in profile's mode; a fourcc or fps of None keeps the driver's default."""
+    if profile.fourcc is not None:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*profile.fourcc))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, profile.width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, profile.height)
+    if profile.fps is not None:
+        cap.set(cv2.CAP_PROP_FPS, profile.fps)
+    # Set buffer size to 1 if supported (reduces lag)
+    if hasattr(cv2, 'CAP_PROP_BUFFERSIZE'):
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+
+def _actual_fourcc(cap):
+    code = int(cap.get(cv2.CAP_PROP_FOURCC))
+    return "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+
+
+def measure_buffered_frames(cap, interval):
+    """
+    Counts frames the driver has queued: after idling for several frame
+    intervals, grabs that return well within one interval were already
+    waiting in the buffer.
+    """
+    time.sleep(4 * interval)
+    buffered = 0
+    for _ in range(8):
+        start = time.perf_counter()
+        if not cap.grab():
+            break
+        if time.perf_counter() - start > 0.5 * interval:
+            break
+        buffered += 1
+    return buffered
+
+
+def measure_profile(cap, candidate):
+    """Applies candidate and returns the measured CaptureProfile, or None if unsupported."""
+    apply_profile(cap, candidate)
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    fourcc = _actual_fourcc(cap)
+    if (width, height) != (candidate.width, candidate.height) or fourcc != candidate.fourcc:
+        return None
+    for _ in range(WARMUP_FRAMES):
+        if not cap.grab():
+            return None
+    start = time.perf_counter()
+    for _ in range(SAMPLE_FRAMES):
+        if not cap.grab():
+            return None
+    measured_fps = SAMPLE_FRAMES / (time.perf_counter() - start)
+    interval = 1.0 / measured_fps
+    buffered = measure_buffered_frames(cap, interval)
+    # One queued frame is at most an interval old; anything beyond is stale
+    drain = max(buffered - 1, 0)
+    return CaptureProfile(
+        width, height, fourcc, candidate.fps,
+        measured_fps=measured_fps, drain=drain,
+        latency_ms=1000.0 * interval * (drain + 1)
+    )
+
+
+def probe_camera(index, resolutions, fourccs=FOURCCS, frame_rates=FRAME_RATES):
+    """
+    Benchmarks every resolution/FOURCC/FPS combination the camera accepts
+    and returns the best profile: the highest delivered FPS, then the lowest
+    latency, then the earliest resolution in resolutions.
+    """
+    cap = cv2.VideoCapture(index)
+    if not cap.isOpened():
+        raise RuntimeError("Error: Could not open camera.")
+    results = []
+    try:
+        for order, (width, height) in enumerate(resolutions):
+            for fourcc in fourccs:
+                for fps in frame_rates:
+                    profile = measure_profile(cap, CaptureProfile(width, height, fourcc, fps))
+                    if profile is not None:
+                        print(f"Camera probe: {profile}")
+                        results.append((order, profile))
+    finally:
+        cap.release()
+    if not results:
+        return None
+    best_fps = max(profile.measured_fps for _, profile in results)
+    # Treat rates within 10% of the best as equal; webcams report jittery FPS
+    fast = [(order, p) for order, p in results if p.measured_fps >= 0.9 * best_fps]
+    fast.sort(key=lambda item: (item[1].latency_ms, item[0]))
+    return fast[0][1]
+
+
+def device_key(index):
+    """Stable cache key for a camera, using its V4L2 name when available."""
+    name_path = f"/sys/class/video4linux/video{index}/name"
+    if os.path.exists(name_path):
+        with open(name_path) as f:
+            return f"{f.read().strip()}#{index}"
+    return f"camera:{index}"
+
+
+def profile_key(index, width, height):
+    return f"{device_key(index)}@{width}x{height}"
+
+
+def resolve_profile(profiles, index, width, height):
+    """
+    Looks the camera up in profiles (config['capture_profiles']), probing it
+    on a miss. Returns (profile, entry): entry is the (key, value) pair to
+    cache with store_profile(), or None on a cache hit. A probe that finds
+    no usable profile is cached as null, so it isn't repeated on every start.
+    """
+    key = profile_key(index, width, height)
+    if key in profiles:
+        if profiles[key] is None:
+            return None, None
+        try:
+            return CaptureProfile.from_dict(profiles[key]), None
+        except TypeError:
+            pass
+    resolutions = [(width, height)]
+    for fallback in ((1280, 720), (640, 480)):
+        if fallback not in resolutions and fallback[0] <= width:
+            resolutions.append(fallback)
+    profile = probe_camera(index, resolutions)
+    return profile, (key, profile.to_dict() if profile is not None else None)
+
+
+def store_profile(config, key, value):
+    # Replaces the dict instead of changing it in place, so a save running
+    # on the config store's thread never sees it change
+    profiles = dict(config['capture_profiles'])
+    profiles[key] = value
+    config['capture_profiles'] = profiles
@@ -0,0 +1,106 @@
+"""
+Builds the tracking and control objects from a ConfigStore, shared by the
+GUI and the headless daemon.
+"""
+from src.capture_profile import resolve_profile, store_profile
+from src.cursor_interpolator import CursorInterpolator
+from src.frame_sources import create_source, camera_index
+from src.gesture_controller import GestureController
+from src.hand_identity import HandAssociator, handedness_code
+from src.hand_tracker import HandTracker
+from src.kinetic_scroll import KineticScroller
+from src.motion_gate import MotionGate
+from src.scheduler import IdleScheduler
+from src.config_store import target_options
+from src.startup import STARTUP
+
+
+def create_hand_tracker(config, default_width=640, default_height=480, on_profile=None):
+    """
+    Raises RuntimeError if the frame source can't be opened. A new probe
+    result is stored in config, or passed as (key, value) to on_profile
+    when the caller has to store it on another thread.
+    """
+    capture_width = config['capture_width'] or default_width
+    capture_height = config['capture_height'] or default_height
+    frame_source = config['frame_source']
+    profile = None
+    if frame_source.startswith('camera') and config['probe_camera']:
+        # Probed once per camera and resolution, then cached in config.json
+        profile, entry = resolve_profile(
+            config['capture_profiles'], camera_index(frame_source), capture_width, capture_height
+        )
+        if entry is not None:
+            if on_profile is not None:
+                on_profile(*entry)
+            else:
+                store_profile(config, *entry)
+    source = create_source(frame_source, capture_width, capture_height, profile)
+    STARTUP.mark("camera opened")
+    tracker = HandTracker(
+        frame_width=capture_width,
+        frame_height=capture_height,
+        source=source,
+        max_num_hands=config['max_num_hands'],
+        detection_confidence=config['detection_confidence'],
+        tracking_confidence=config['tracking_confidence'],
+        inference_mode=config['inference_mode'],
+        inference_size=config['inference_size'],
+        roi_padding=config['roi_padding'],
+        roi_refresh_interval=config['roi_refresh_interval'],
+        motion_gate=MotionGate(max_skip=config['motion_gate_max_skip']) if config['motion_gate'] else None
+    )
+    STARTUP.mark("hand model loaded")
+    return tracker
+
+
+def create_controllers(config, backend, refresh_rate=60.0):
+    """
+    Returns (controllers, interpolator, scrollers): one GestureController
+    per hand slot, the optional CursorInterpolator driving the first one at
+    refresh_rate and the KineticScrollers. The interpolator and scrollers
+    have to be started and stopped with tracking.
+    """
+    gesture_options = target_options(config, "gesture")
+    controller = GestureController(backend=backend, **gesture_options)
+    interpolator = None
+    if config['cursor_interpolation']:
+        # Drive the cursor at the monitor's refresh rate, not the camera's
+        interpolator = CursorInterpolator(
+            backend, rate_hz=refresh_rate,
+            mode=config['cursor_interpolation_mode']
+        )
+        controller.interpolator = interpolator
+    # One controller per hand slot: the first hand points, a second one scrolls
+    controllers = [controller]
+    second_hand = config['second_hand']
+    if second_hand:
+        controllers.append(GestureController(backend=backend, role=second_hand, **gesture_options))
+    scrollers = []
+    if config['kinetic_scroll']:
+        for controller in controllers:
+            controller.scroller = KineticScroller(
+                backend,
+                rate_hz=config['scroll_rate'],
+                friction=config['scroll_friction']
+            )
+            scrollers.append(controller.scroller)
+    return controllers, interpolator, scrollers
+
+
+def create_scheduler(config):
+    if not config['idle_mode']:
+        return None
+    return IdleScheduler(
+        idle_after=config['idle_after_frames'],
+        idle_fps=config['idle_fps'],
+        idle_inference_size=config['idle_inference_size']
+    )
+
+
+def create_associator(config, max_num_hands):
+    primary_hand = config['primary_hand']
+    return HandAssociator(
+        max_num_hands,
+        preferred=handedness_code(primary_hand) if primary_hand else None
+    )
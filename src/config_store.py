@@ -0,0 +1,329 @@
+import copy
+import json
+import os
+import stat
+import tempfile
+import threading
+import time
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.json')
+
+
+def _read_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Read once at import, before any thread could change it
+UMASK = _read_umask()
+
+
+class Option:
+    """
+    One config.json setting. kind is the expected Python type (int is
+    accepted for float), choices restricts the allowed values and nullable
+    allows null. Options with a target ("gesture" or "tracker") name an
+    attribute of that object; live ones are applied while running, the
+    others take effect on the next start. Live options without a target are
+    applied by the window itself.
+    """
+
+    def __init__(self, default, kind, choices=None, nullable=False, target=None, live=False):
+        self.default = default
+        self.kind = kind
+        self.choices = choices
+        self.nullable = nullable
+        self.target = target
+        self.live = live
+
+    def validate(self, value):
+        if value is None:
+            if self.nullable:
+                return None
+            raise ValueError("must not be null")
+        if self.kind is float and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        if not isinstance(value, self.kind) or (self.kind is int and isinstance(value, bool)):
+            raise ValueError(f"expected {self.kind.__name__}, got {type(value).__name__}")
+        if self.choices is not None and value not in self.choices:
+            raise ValueError(f"expected one of {', '.join(map(str, self.choices))}")
+        return value
+
+
+SCHEMA = {
+    # GestureController
+    "sensitivity": Option(1.0, float, target="gesture", live=True),
+    "smoothing": Option(0.2, float, target="gesture", live=True),
+    "pinch_threshold": Option(0.04, float, target="gesture", live=True),
+    "right_pinch_threshold": Option(0.04, float, target="gesture", live=True),
+    "scroll_threshold": Option(0.03, float, target="gesture", live=True),
+    "scroll_sensitivity": Option(100.0, float, target="gesture", live=True),
+    "dead_zone": Option(0.02, float, target="gesture", live=True),
+    "edge_boost_factor": Option(2.0, float, target="gesture", live=True),
+    "smoothing_window": Option(5, int, target="gesture", live=True),
+    "filter_type": Option("one_euro", str, choices=("one_euro", "kalman", "moving_average"),
+                          target="gesture", live=True),
+    "filter_min_cutoff": Option(1.0, float, target="gesture", live=True),
+    "filter_beta": Option(0.007, float, target="gesture", live=True),
+    # HandTracker
+    "max_num_hands": Option(2, int, target="tracker"),
+    "detection_confidence": Option(0.7, float, target="tracker"),
+    "tracking_confidence": Option(0.7, float, target="tracker"),
+    "capture_width": Option(None, int, nullable=True, target="tracker"),
+    "capture_height": Option(None, int, nullable=True, target="tracker"),
+    "frame_source": Option("camera:0", str, target="tracker"),
+    "inference_mode": Option("thread", str, choices=("thread", "process"), target="tracker"),
+    "inference_size": Option(None, int, nullable=True, target="tracker"),
+    "roi_padding": Option(0.3, float, target="tracker", live=True),
+    "roi_refresh_interval": Option(15, int, target="tracker", live=True),
+    "probe_camera": Option(True, bool),
+    "capture_profiles": Option({}, dict),
+    "motion_gate": Option(True, bool),
+    "motion_gate_max_skip": Option(3, int),
+    # Hands and output
+    "second_hand": Option("scroll", str, choices=("pointer", "scroll"), nullable=True),
+    "primary_hand": Option(None, str, choices=("Left", "Right"), nullable=True),
+    "input_backend": Option("auto", str, choices=("auto", "xtest", "pyautogui", "null")),
+    "cursor_interpolation": Option(True, bool),
+    "cursor_interpolation_mode": Option("extrapolate", str, choices=("extrapolate", "interpolate")),
+    "kinetic_scroll": Option(True, bool),
+    "scroll_rate": Option(120.0, float),
+    "scroll_friction": Option(4.0, float),
+    # Pipeline and preview
+    "idle_mode": Option(True, bool),
+    "idle_after_frames": Option(30, int),
+    "idle_fps": Option(5.0, float),
+    "idle_inference_size": Option(160, int),
+    "preview_enabled": Option(True, bool, live=True),
+    "preview_fps": Option(30.0, float),
+    # Voice
+    "voice_engine": Option("google", str, choices=("google", "vosk")),
+    "vosk_model": Option(None, str, nullable=True),
+    "dictation_strategy": Option("auto", str, choices=("auto", "type", "paste")),
+}
+
+
+def validate_config(data, schema=SCHEMA):
+    """
+    Returns data with every known key checked against schema. Invalid values
+    are dropped with a message so the default applies; unknown keys are
+    kept as they are.
+    """
+    values = {}
+    for key, value in data.items():
+        option = schema.get(key)
+        if option is None:
+            values[key] = value
+            continue
+        try:
+            values[key] = option.validate(value)
+        except ValueError as e:
+            print(f"Config: ignoring {key}: {e}")
+    return values
+
+
+class ConfigStore:
+    """
+    config.json behind a dict-like interface. Reads fall back to the schema
+    defaults. Writes are debounced by save_delay seconds and done on a
+    background thread, atomically through a temporary file and a rename, so
+    a crash never leaves a half-written file. The same thread polls the file
+    every poll_interval seconds and merges external edits, passing the
+    changed keys to every listener (called on that thread).
+    """
+
+    def __init__(self, path, schema=SCHEMA, save_delay=0.5, poll_interval=1.0):
+        self.path = path
+        self.schema = schema
+        self.save_delay = save_delay
+        self.poll_interval = poll_interval
+        self.cond = threading.Condition()
+        self.listeners = []
+        self.save_at = None
+        self.mtime = None
+        self.values = {}
+        # Contents of the file as last read or written, to tell external edits apart
+        self.saved = {}
+        data = self._read()
+        if data is not None:
+            self.values = data
+            self.saved = copy.deepcopy(data)
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="config-store", daemon=True)
+        self.thread.start()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return None
+        try:
+            self.mtime = os.stat(self.path).st_mtime_ns
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Config: failed to load {self.path}: {e}")
+            return None
+        if not isinstance(data, dict):
+            print(f"Config: {self.path} does not contain an object")
+            return None
+        return validate_config(data, self.schema)
+
+    def __getitem__(self, key):
+        with self.cond:
+            if key in self.values:
+                return self.values[key]
+        return copy.deepcopy(self.schema[key].default)
+
+    def get(self, key, default=None):
+        with self.cond:
+            if key in self.values:
+                return self.values[key]
+        if key in self.schema:
+            return copy.deepcopy(self.schema[key].default)
+        return default
+
+    def __contains__(self, key):
+        with self.cond:
+            return key in self.values
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def set(self, key, value):
+        option = self.schema.get(key)
+        if option is not None:
+            value = option.validate(value)
+        with self.cond:
+            if key in self.values and self.values[key] == value:
+                return
+            self.values[key] = value
+            self._schedule()
+
+    def setdefault(self, key, default):
+        with self.cond:
+            if key not in self.values:
+                self.values[key] = default
+                self._schedule()
+            return self.values[key]
+
+    def save(self):
+        """Schedules a write, e.g. after changing a nested value in place."""
+        with self.cond:
+            self._schedule()
+
+    def _schedule(self):
+        self.save_at = time.monotonic() + self.save_delay
+        self.cond.notify()
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def _write(self):
+        with self.cond:
+            snapshot = copy.deepcopy(self.values)
+            self.save_at = None
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".config.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(snapshot, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp creates the file 0600; keep the permissions config.json had
+            try:
+                mode = stat.S_IMODE(os.stat(self.path).st_mode)
+            except FileNotFoundError:
+                mode = 0o666 & ~UMASK
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Config: failed to save {self.path}: {e}")
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+        with self.cond:
+            self.saved = snapshot
+            self.mtime = os.stat(self.path).st_mtime_ns
+
+    def _reload(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return
+        if mtime == self.mtime:
+            return
+        data = self._read()
+        if data is None:
+            return
+        with self.cond:
+            changed = {key: value for key, value in data.items() if self.saved.get(key) != value}
+            self.values.update(changed)
+            self.saved = data
+        if changed:
+            print(f"Config: reloaded {', '.join(sorted(changed))}")
+            for listener in self.listeners:
+                listener(changed)
+
+    def _run(self):
+        next_poll = time.monotonic() + self.poll_interval
+        while True:
+            with self.cond:
+                if not self.running:
+                    break
+                now = time.monotonic()
+                deadline = next_poll if self.save_at is None else min(self.save_at, next_poll)
+                if deadline > now:
+                    self.cond.wait(deadline - now)
+                    continue
+                due = self.save_at is not None and self.save_at <= now
+            if due:
+                self._write()
+            if time.monotonic() >= next_poll:
+                self._reload()
+                next_poll = time.monotonic() + self.poll_interval
+
+    def close(self):
+        """Stops the background thread and writes any pending change."""
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        self.thread.join(timeout=2.0)
+        if self.save_at is not None:
+            self._write()
+
+
+def target_options(config, target, schema=SCHEMA):
+    """Keyword arguments for the object target ("gesture" or "tracker") from config."""
+    return {key: config[key] for key, option in schema.items() if option.target == target}
+
+
+def apply_live_options(changed, controllers=(), tracker=None, schema=SCHEMA):
+    """
+    Applies the live options in changed to the running GestureControllers
+    and HandTracker. Returns the changed keys that need a restart.
+    """
+    restart = []
+    rebuild_filter = False
+    for key, value in changed.items():
+        option = schema.get(key)
+        if option is None:
+            continue
+        if not option.live:
+            restart.append(key)
+            continue
+        if option.target is None:
+            continue
+        if value is None:
+            value = option.default
+        if option.target == "gesture":
+            for controller in controllers:
+                if controller is not None:
+                    setattr(controller, key, value)
+            rebuild_filter = rebuild_filter or key.startswith("filter_") or key == "smoothing_window"
+        elif option.target == "tracker" and tracker is not None:
+            setattr(tracker, key, value)
+    if rebuild_filter:
+        for controller in controllers:
+            if controller is not None:
+                controller.set_filter(controller.filter_type)
+    return restart
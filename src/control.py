@@ -0,0 +1,38 @@
+"""
+Client side of the headless daemon's control socket. Kept apart from
+src.daemon so sending a command doesn't load the tracking stack.
+"""
+import json
+import os
+import socket
+import tempfile
+
+
+def default_control_address():
+    """A Unix socket in the user's runtime directory, or a localhost port without AF_UNIX."""
+    if not hasattr(socket, "AF_UNIX"):
+        return ("127.0.0.1", 47651)
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(directory, f"invisible-mouse-{os.getuid()}.sock")
+
+
+def send_command(command, address=None, timeout=5.0):
+    """Sends one command to a running daemon and returns its decoded reply."""
+    address = address or default_control_address()
+    family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(address)
+        sock.sendall((command + "\n").encode("utf-8"))
+        with sock.makefile("rb") as reply:
+            return json.loads(reply.readline())
+
+
+def parse_address(text):
+    """Parses HOST:PORT as a TCP address; anything else is a Unix socket path."""
+    if text is None:
+        return None
+    host, sep, port = text.rpartition(":")
+    if sep and port.isdigit() and "/" not in text:
+        return (host or "127.0.0.1", int(port))
+    return text
@@ -0,0 +1,126 @@
+import math
+import threading
+import time
+
+
+class CursorInterpolator:
+    """
+    Moves the cursor at display refresh rate between the timestamped target
+    positions produced by GestureController at camera rate.
+
+    mode "interpolate" renders one frame interval (plus measured pipeline
+    latency) in the past and never overshoots. mode "extrapolate" predicts
+    the present position from the last two targets, limited to
+    max_extrapolation frame intervals ahead and max_overshoot pixels past
+    the newest target.
+    """
+
+    def __init__(self, backend, rate_hz=60.0, mode="extrapolate", max_extrapolation=1.0, max_overshoot=40.0):
+        self.backend = backend
+        self.rate_hz = rate_hz
+        self.mode = mode
+        self.max_extrapolation = max_extrapolation
+        self.max_overshoot = max_overshoot
+        self.lock = threading.Lock()
+        self.prev_target = None  # (x, y, t)
+        self.target = None
+        self.latency = 0.0
+        self.running = False
+        self.thread = None
+
+    def push_target(self, x, y, timestamp=None):
+        now = time.monotonic()
+        if timestamp is None:
+            timestamp = now
+        with self.lock:
+            # Exponential average of capture-to-target latency
+            if self.target is None:
+                self.latency = now - timestamp
+            else:
+                self.latency += 0.1 * ((now - timestamp) - self.latency)
+            if self.target is not None and timestamp > self.target[2]:
+                self.prev_target = self.target
+            else:
+                self.prev_target = None
+            self.target = (float(x), float(y), timestamp)
+
+    def snap(self, x, y):
+        """Moves the cursor exactly to (x, y) now and holds it there."""
+        with self.backend.lock:
+            with self.lock:
+                timestamp = time.monotonic()
+                self.target = (float(x), float(y), timestamp)
+                self.prev_target = None
+            self.backend.move_to(x, y)
+            self.backend.flush()
+
+    def position(self, now):
+        with self.lock:
+            target = self.target
+            prev = self.prev_target
+            latency = self.latency
+        if target is None:
+            return None
+        x1, y1, t1 = target
+        if prev is None:
+            return x1, y1
+        x0, y0, t0 = prev
+        interval = t1 - t0
+        if self.mode == "interpolate":
+            alpha = (now - latency - interval - t0) / interval
+            alpha = min(max(alpha, 0.0), 1.0)
+        else:
+            alpha = (now - t0) / interval
+            alpha = min(max(alpha, 0.0), 1.0 + self.max_extrapolation)
+        x = x0 + (x1 - x0) * alpha
+        y = y0 + (y1 - y0) * alpha
+        if alpha > 1.0:
+            overshoot = math.hypot(x - x1, y - y1)
+            if overshoot > self.max_overshoot:
+                scale = self.max_overshoot / overshoot
+                x = x1 + (x - x1) * scale
+                y = y1 + (y - y1) * scale
+        return x, y
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="cursor-output", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        with self.lock:
+            self.target = None
+            self.prev_target = None
+
+    def _run(self):
+        period = 1.0 / self.rate_hz
+        next_tick = time.monotonic()
+        failing = False
+        while self.running:
+            # The position is computed under the backend lock too, so a
+            # snap() can't land between computing a point and moving there
+            try:
+                with self.backend.lock:
+                    pos = self.position(time.monotonic())
+                    if pos is not None:
+                        self.backend.move_to(pos[0], pos[1])
+                        self.backend.flush()
+                failing = False
+            except Exception as e:
+                # e.g. pyautogui's fail-safe at a screen corner; keep ticking
+                if not failing:
+                    print(f"Cursor output error: {e!r}")
+                failing = True
+            next_tick += period
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind; don't try to catch up with a burst of moves
+                next_tick = time.monotonic()
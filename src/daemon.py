@@ -0,0 +1,250 @@
+"""
+Headless service: hand tracking and gesture control without the Qt GUI.
+
+    python main.py --headless [--voice] [--control PATH]
+    python main.py --ctl status|start|stop|metrics|voice-on|voice-off|quit
+
+No preview is rendered and no frames are kept beyond the pipeline slots.
+The daemon is controlled over a local socket speaking one command per
+line; every reply is one JSON line. SIGINT and SIGTERM shut it down.
+"""
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+from src.control import default_control_address
+from src.config_store import ConfigStore, DEFAULT_CONFIG_PATH, apply_live_options
+from src.components import create_hand_tracker, create_controllers, create_scheduler, create_associator
+from src.input_backend import create_backend
+from src.pipeline import TrackingPipeline
+from src.scheduler import IDLE
+from src.startup import STARTUP
+
+
+class ControlHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            command = line.decode("utf-8", "replace").strip()
+            if not command:
+                continue
+            reply = self.server.daemon.handle_command(command)
+            self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+    class UnixControlServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+
+class TcpControlServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class Daemon:
+    """
+    Owns the pipeline and the optional voice controller. Tracking starts
+    right away; the control socket can stop and restart it.
+    """
+
+    def __init__(self, config_path=DEFAULT_CONFIG_PATH, control_address=None, voice=False):
+        self.config = ConfigStore(config_path)
+        self.hand_tracker = create_hand_tracker(self.config)
+        self.input_backend = create_backend(self.config['input_backend'])
+        self.controllers, self.interpolator, self.scrollers = create_controllers(self.config, self.input_backend)
+        self.scheduler = create_scheduler(self.config)
+        self.hands_present = False
+        self.pipeline = TrackingPipeline(
+            self.hand_tracker, self.controllers[0],
+            on_hands=self._on_hands,
+            on_error=self._on_pipeline_error,
+            scheduler=self.scheduler,
+            controllers=self.controllers,
+            associator=create_associator(self.config, self.hand_tracker.max_num_hands)
+        )
+        self.voice_controller = None
+        if voice:
+            # Imported here so the speech stack is only loaded when asked for
+            from src.voice_controller import VoiceController
+            self.voice_controller = VoiceController(
+                engine=self.config['voice_engine'],
+                model_path=self.config['vosk_model'],
+                backend=self.input_backend,
+                text_strategy=self.config['dictation_strategy']
+            )
+        self.config.add_listener(self._on_config_changed)
+        self.control_address = control_address or default_control_address()
+        self.server = None
+        self.shutdown_event = threading.Event()
+        self.tracking = False
+        # While the model warms up, start/stop only decide whether tracking
+        # begins once it is ready
+        self.warming_up = False
+        self.start_pending = False
+        self.lock = threading.Lock()
+
+    def _on_hands(self, detected):
+        self.hands_present = detected
+
+    def _on_pipeline_error(self, message):
+        # Called from a pipeline thread, which stop_tracking() joins
+        threading.Thread(target=self.stop_tracking, name="pipeline-stop", daemon=True).start()
+
+    def _on_config_changed(self, changed):
+        restart = apply_live_options(changed, self.controllers, self.hand_tracker)
+        if restart:
+            print(f"Config: {', '.join(sorted(restart))} take effect after a restart")
+
+    def start_tracking(self):
+        with self.lock:
+            if self.warming_up:
+                self.start_pending = True
+                return
+            if not self._start_locked():
+                return
+        print("Daemon: hand tracking started.")
+
+    def _start_locked(self):
+        if self.tracking:
+            return False
+        self.tracking = True
+        if self.interpolator:
+            self.interpolator.start()
+        for scroller in self.scrollers:
+            scroller.start()
+        self.pipeline.start()
+        return True
+
+    def _finish_warm_up(self):
+        """Starts tracking unless a stop command came in during the warm-up."""
+        with self.lock:
+            self.warming_up = False
+            if not (self.start_pending and self._start_locked()):
+                return False
+        print("Daemon: hand tracking started.")
+        return True
+
+    def stop_tracking(self):
+        with self.lock:
+            if self.warming_up:
+                self.start_pending = False
+                return
+            if not self.tracking:
+                return
+            self.tracking = False
+            self.pipeline.stop()
+            if self.interpolator:
+                self.interpolator.stop()
+            for scroller in self.scrollers:
+                scroller.stop()
+        print("Daemon: hand tracking stopped.")
+
+    def status(self):
+        state = {
+            "tracking": self.tracking,
+            "warming_up": self.warming_up,
+            "hand_detected": self.hands_present if self.tracking else False,
+            "fps": round(self.pipeline.fps, 1) if self.tracking else 0.0,
+            "idle": bool(self.scheduler and self.scheduler.state == IDLE),
+            "input_backend": self.input_backend.name,
+            "input_latency_ms": round(self.input_backend.latency_stats()[0], 2),
+            "voice": bool(self.voice_controller and self.voice_controller.listening),
+        }
+        if self.pipeline.error:
+            state["error"] = self.pipeline.error
+        gate = self.hand_tracker.motion_gate
+        if gate is not None:
+            state["motion_gate_skip_rate"] = round(gate.skip_rate, 3)
+        return state
+
+    def handle_command(self, command):
+        if command == "start":
+            self.start_tracking()
+        elif command == "stop":
+            self.stop_tracking()
+        elif command == "status":
+            pass
+        elif command in ("voice-on", "voice-off"):
+            if self.voice_controller is None:
+                return {"error": "voice control is not enabled (start with --voice)"}
+            if command == "voice-on":
+                self.voice_controller.listen_and_execute()
+            else:
+                self.voice_controller.stop()
+        elif command == "metrics":
+            return {"metrics": self.pipeline.metrics.summary(), "startup": STARTUP.summary()}
+        elif command == "quit":
+            self.shutdown_event.set()
+            return {"ok": True}
+        else:
+            return {"error": f"unknown command: {command}"}
+        return self.status()
+
+    def _start_server(self):
+        address = self.control_address
+        if isinstance(address, str):
+            if os.path.exists(address):
+                self._remove_stale_socket(address)
+            # Created owner-only, so no other user can connect in between
+            umask = os.umask(0o177)
+            try:
+                self.server = UnixControlServer(address, ControlHandler)
+            finally:
+                os.umask(umask)
+        else:
+            self.server = TcpControlServer(address, ControlHandler)
+        self.server.daemon = self
+        threading.Thread(target=self.server.serve_forever, name="control-socket", daemon=True).start()
+        print(f"Daemon: control socket at {address}")
+
+    def _remove_stale_socket(self, address):
+        """Removes a socket left by a daemon that didn't shut down cleanly."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(address)
+            except ConnectionRefusedError:
+                # Nothing is listening on it
+                os.unlink(address)
+                return
+            except OSError as e:
+                raise RuntimeError(f"Can't use control socket {address}: {e}")
+        raise RuntimeError(f"Another headless instance is already running at {address}")
+
+    def run(self):
+        """Runs until SIGINT/SIGTERM or a quit command; must be called from the main thread."""
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: self.shutdown_event.set())
+        with self.lock:
+            self.warming_up = True
+            self.start_pending = True
+        try:
+            self._start_server()
+            # The control socket already answers while the model warms up
+            self.hand_tracker.warm_up()
+            STARTUP.mark("first inference")
+            if self.shutdown_event.is_set():
+                return
+            if self._finish_warm_up():
+                STARTUP.mark("tracking started")
+            if self.voice_controller is not None:
+                self.voice_controller.listen_and_execute()
+            self.shutdown_event.wait()
+        finally:
+            self.close()
+
+    def close(self):
+        print("Daemon: shutting down.")
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            if isinstance(self.control_address, str) and os.path.exists(self.control_address):
+                os.unlink(self.control_address)
+            self.server = None
+        self.stop_tracking()
+        if self.voice_controller is not None:
+            self.voice_controller.close()
+        self.hand_tracker.release()
+        self.input_backend.close()
+        self.config.close()
@@ -0,0 +1,57 @@
+import numpy as np
+
+NUM_LANDMARKS = 21
+WRIST = 0
+THUMB_TIP = 4
+INDEX_TIP = 8
+MIDDLE_TIP = 12
+RING_TIP = 16
+PINKY_TIP = 20
+FINGER_TIPS = np.array([INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP])
+PALM = np.array([0, 5, 9, 13, 17])  # Wrist and finger MCP joints
+FINGER_COLUMN = {INDEX_TIP: 0, MIDDLE_TIP: 1, RING_TIP: 2, PINKY_TIP: 3}
+
+
+def empty_landmarks(max_num_hands, slots=1):
+    """Preallocated landmark storage shaped (slots, hands, 21, 3)."""
+    return np.zeros((slots, max_num_hands, NUM_LANDMARKS, 3), dtype=np.float32)
+
+
+class HandFeatures:
+    """
+    Per-frame gesture features for every tracked hand, computed in one
+    vectorized pass over a (hands, 21, 3) landmark array into preallocated
+    buffers.
+    """
+
+    def __init__(self, max_num_hands=2):
+        self.max_num_hands = max_num_hands
+        self.count = 0
+        # Thumb tip to index/middle/ring/pinky tip, in normalized x/y units
+        self.pinch_distances = np.zeros((max_num_hands, len(FINGER_TIPS)), dtype=np.float32)
+        # Mean y of the index and middle tips, used for two-finger scroll
+        self.scroll_y = np.zeros(max_num_hands, dtype=np.float32)
+        self.palm_centroid = np.zeros((max_num_hands, 2), dtype=np.float32)
+        self._tips = np.zeros((max_num_hands, len(FINGER_TIPS), 3), dtype=np.float32)
+        self._palm = np.zeros((max_num_hands, len(PALM), 3), dtype=np.float32)
+        self._diff = np.zeros((max_num_hands, len(FINGER_TIPS), 2), dtype=np.float32)
+
+    def update(self, landmarks):
+        n = min(len(landmarks), self.max_num_hands)
+        self.count = n
+        if n == 0:
+            return self
+        landmarks = landmarks[:n]
+        tips = self._tips[:n]
+        diff = self._diff[:n]
+        np.take(landmarks, FINGER_TIPS, axis=1, out=tips)
+        np.subtract(tips[..., :2], landmarks[:, THUMB_TIP:THUMB_TIP + 1, :2], out=diff)
+        np.hypot(diff[..., 0], diff[..., 1], out=self.pinch_distances[:n])
+        np.mean(tips[:, :2, 1], axis=1, out=self.scroll_y[:n])
+        palm = self._palm[:n]
+        np.take(landmarks, PALM, axis=1, out=palm)
+        np.mean(palm[..., :2], axis=1, out=self.palm_centroid[:n])
+        return self
+
+    def pinch_distance(self, hand_index, finger_tip_idx):
+        return float(self.pinch_distances[hand_index, FINGER_COLUMN[finger_tip_idx]])
@@ -0,0 +1,147 @@
+import math
+from collections import deque
+
+
+class LowPassFilter:
+    def __init__(self):
+        self.value = None
+
+    def filter(self, x, alpha):
+        if self.value is None:
+            self.value = x
+        else:
+            self.value = alpha * x + (1.0 - alpha) * self.value
+        return self.value
+
+    def reset(self):
+        self.value = None
+
+
+class OneEuroFilter:
+    """
+    Speed-adaptive low-pass filter (Casiez et al., CHI 2012). The cutoff
+    frequency rises with the signal's speed, so slow motion is smoothed
+    heavily and fast motion passes with little lag.
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.007, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.x_filter = LowPassFilter()
+        self.dx_filter = LowPassFilter()
+        self.last_time = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2.0 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def filter(self, x, timestamp):
+        if self.last_time is None or self.x_filter.value is None:
+            self.last_time = timestamp
+            self.dx_filter.filter(0.0, 1.0)
+            return self.x_filter.filter(x, 1.0)
+        dt = timestamp - self.last_time
+        if dt <= 0:
+            # Repeated or out-of-order timestamp: no time to move in
+            return self.x_filter.value
+        self.last_time = timestamp
+        dx = (x - self.x_filter.value) / dt
+        edx = self.dx_filter.filter(dx, self._alpha(self.d_cutoff, dt))
+        cutoff = self.min_cutoff + self.beta * abs(edx)
+        return self.x_filter.filter(x, self._alpha(cutoff, dt))
+
+    def reset(self):
+        self.x_filter.reset()
+        self.dx_filter.reset()
+        self.last_time = None
+
+
+class ConstantVelocityKalmanFilter:
+    """
+    One-axis Kalman filter with a [position, velocity] state. process_noise
+    is the white acceleration spectral density, measurement_noise the
+    variance of a position sample.
+    """
+
+    def __init__(self, process_noise=5000.0, measurement_noise=25.0):
+        self.q = process_noise
+        self.r = measurement_noise
+        self.reset()
+
+    def filter(self, x, timestamp):
+        if self.last_time is None:
+            self.p, self.v = x, 0.0
+            self.p00, self.p01, self.p11 = self.r, 0.0, self.r
+            self.last_time = timestamp
+            return x
+        dt = max(timestamp - self.last_time, 1e-4)
+        self.last_time = timestamp
+        # Predict
+        self.p += self.v * dt
+        q = self.q
+        p00 = self.p00 + dt * (2.0 * self.p01 + dt * self.p11) + q * dt ** 3 / 3.0
+        p01 = self.p01 + dt * self.p11 + q * dt ** 2 / 2.0
+        p11 = self.p11 + q * dt
+        # Update with the position measurement
+        s = p00 + self.r
+        k0 = p00 / s
+        k1 = p01 / s
+        residual = x - self.p
+        self.p += k0 * residual
+        self.v += k1 * residual
+        self.p00 = (1.0 - k0) * p00
+        self.p01 = (1.0 - k0) * p01
+        self.p11 = p11 - k1 * p01
+        return self.p
+
+    def reset(self):
+        self.p = 0.0
+        self.v = 0.0
+        self.p00 = self.p01 = self.p11 = 0.0
+        self.last_time = None
+
+
+class MovingAverageFilter:
+    """Legacy fixed-window mean, kept for the moving_average setting."""
+
+    def __init__(self, window=5):
+        self.history = deque(maxlen=window)
+        self.total = 0.0
+
+    def filter(self, x, timestamp):
+        if len(self.history) == self.history.maxlen:
+            self.total -= self.history[0]
+        self.history.append(x)
+        self.total += x
+        return self.total / len(self.history)
+
+    def reset(self):
+        self.history.clear()
+        self.total = 0.0
+
+
+FILTERS = {
+    "one_euro": OneEuroFilter,
+    "kalman": ConstantVelocityKalmanFilter,
+    "moving_average": MovingAverageFilter,
+}
+
+
+class PointFilter:
+    """Filters 2D points with an independent filter per axis."""
+
+    def __init__(self, filter_type="one_euro", **params):
+        if filter_type not in FILTERS:
+            raise ValueError(f"Unknown filter type: {filter_type}")
+        self.filter_type = filter_type
+        self.x = FILTERS[filter_type](**params)
+        self.y = FILTERS[filter_type](**params)
+
+    def filter(self, x, y, timestamp):
+        return self.x.filter(x, timestamp), self.y.filter(y, timestamp)
+
+    def reset(self):
+        self.x.reset()
+        self.y.reset()
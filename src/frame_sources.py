@@ -0,0 +1,205 @@
+import os
+import time
+from abc import ABC, abstractmethod
+import cv2
+import numpy as np
+from src.capture_profile import CaptureProfile, apply_profile
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class FrameSource(ABC):
+    """
+    Produces BGR frames for HandTracker. read() returns a frame or None and
+    sets last_capture_time to the time.monotonic() at which it was captured.
+    size=(width, height), when given, resizes frames from sources that
+    can't be configured to that resolution.
+    """
+
+    def __init__(self, size=None):
+        self.size = size
+        self.last_capture_time = 0.0
+
+    @abstractmethod
+    def read(self):
+        pass
+
+    def _resize(self, frame):
+        if self.size is not None and (frame.shape[1], frame.shape[0]) != tuple(self.size):
+            return cv2.resize(frame, tuple(self.size), interpolation=cv2.INTER_AREA)
+        return frame
+
+    def release(self):
+        pass
+
+
+class CameraSource(FrameSource):
+    """
+    Live camera. With a CaptureProfile the camera is put in the probed mode
+    and read() drops at most profile.drain stale frames; without one it
+    drains up to two, like the old fixed double grab. Draining stops early
+    as soon as a grab blocks, since a blocking grab waited for a new frame.
+    """
+
+    def __init__(self, index=0, width=640, height=480, profile=None):
+        super().__init__()
+        self.index = index
+        self.cap = cv2.VideoCapture(index)
+        if not self.cap.isOpened():
+            raise RuntimeError("Error: Could not open camera.")
+        self.profile = profile
+        if profile is not None:
+            apply_profile(self.cap, profile)
+            self.drain = profile.drain
+            interval = 1.0 / profile.measured_fps if profile.measured_fps else 1.0 / 30
+        else:
+            # Just the frame size, in the driver's default format and rate
+            apply_profile(self.cap, CaptureProfile(width, height, None, None))
+            self.drain = 2
+            interval = 1.0 / 30
+        self.stale_threshold = 0.5 * interval
+        self.drained = 0
+
+    def read(self):
+        fresh = False
+        for _ in range(self.drain):
+            start = time.perf_counter()
+            if not self.cap.grab():
+                return None
+            if time.perf_counter() - start > self.stale_threshold:
+                fresh = True
+                break
+            # Returned immediately, so it came from the driver's queue
+            self.drained += 1
+        if not fresh and not self.cap.grab():
+            return None
+        success, frame = self.cap.retrieve()
+        self.last_capture_time = time.monotonic()
+        if not success or frame is None:
+            return None
+        return frame
+
+    def release(self):
+        if self.cap.isOpened():
+            self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    """
+    Frames from a video file. With realtime=True frames are paced at the
+    file's frame rate like a camera; otherwise they are read as fast as
+    the consumer asks.
+    """
+
+    def __init__(self, path, size=None, loop=False, realtime=False):
+        super().__init__(size)
+        self.path = path
+        self.loop = loop
+        self.realtime = realtime
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Error: Could not open video file {path}.")
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.next_time = None
+
+    def read(self):
+        if self.realtime:
+            now = time.monotonic()
+            if self.next_time is None:
+                self.next_time = now
+            elif self.next_time > now:
+                time.sleep(self.next_time - now)
+            self.next_time += 1.0 / self.fps
+        success, frame = self.cap.read()
+        if not success and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, frame = self.cap.read()
+        self.last_capture_time = time.monotonic()
+        if not success or frame is None:
+            return None
+        return self._resize(frame)
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """Frames from the images in a directory, in file name order."""
+
+    def __init__(self, path, size=None, loop=False):
+        super().__init__(size)
+        self.files = sorted(
+            os.path.join(path, name) for name in os.listdir(path)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if not self.files:
+            raise RuntimeError(f"Error: No images found in {path}.")
+        self.loop = loop
+        self.index = 0
+
+    def read(self):
+        if self.index >= len(self.files):
+            if not self.loop:
+                return None
+            self.index = 0
+        frame = cv2.imread(self.files[self.index])
+        self.index += 1
+        self.last_capture_time = time.monotonic()
+        if frame is None:
+            return None
+        return self._resize(frame)
+
+
+class SyntheticSource(FrameSource):
+    """
+    Generated frames with a moving skin-colored blob, for exercising the
+    pipeline without any input files. frames=None never ends.
+    """
+
+    def __init__(self, size=(640, 480), fps=0.0, frames=None):
+        super().__init__(size)
+        self.fps = fps
+        self.frames = frames
+        self.count = 0
+        width, height = size
+        self.background = np.full((height, width, 3), 40, dtype=np.uint8)
+        self.next_time = None
+
+    def read(self):
+        if self.frames is not None and self.count >= self.frames:
+            return None
+        if self.fps > 0:
+            now = time.monotonic()
+            if self.next_time is None:
+                self.next_time = now
+            elif self.next_time > now:
+                time.sleep(self.next_time - now)
+            self.next_time += 1.0 / self.fps
+        width, height = self.size
+        frame = self.background.copy()
+        t = self.count / 30.0
+        center = (int(width * (0.5 + 0.3 * np.cos(t))), int(height * (0.5 + 0.3 * np.sin(t))))
+        cv2.circle(frame, center, max(8, height // 8), (120, 160, 220), -1)
+        self.count += 1
+        self.last_capture_time = time.monotonic()
+        return frame
+
+
+def camera_index(spec):
+    _, _, index = spec.partition(":")
+    return int(index or 0)
+
+
+def create_source(spec="camera:0", width=640, height=480, profile=None):
+    """
+    Builds a source from a spec string: "camera:INDEX", "synthetic", a
+    directory of images or a video file path. profile is a CaptureProfile
+    for camera sources.
+    """
+    if spec.startswith("camera"):
+        return CameraSource(camera_index(spec), width, height, profile)
+    if spec == "synthetic":
+        return SyntheticSource((width, height))
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, (width, height), loop=True)
+    return VideoFileSource(spec, (width, height), loop=True, realtime=True)
@@ -1,6 +1,11 @@
-import pyautogui
+import time
 import numpy as np
-from collections import deque
+from src.features import HandFeatures, INDEX_TIP, MIDDLE_TIP
+from src.input_backend import create_backend
+from src.filters import FILTERS, PointFilter
+
+# pointer: cursor, clicks, drag and scroll; scroll: two-finger scroll only
+ROLES = ("pointer", "scroll")
 
 class GestureController:
     def __init__(
@@ -13,10 +18,19 @@ class GestureController:
         sensitivity=1.0,
         dead_zone=0.02,
         edge_boost_factor=2.0,
-        smoothing_window=5
+        smoothing_window=5,
+        backend=None,
+        filter_type="one_euro",
+        filter_min_cutoff=1.0,
+        filter_beta=0.007,
+        role="pointer"
     ):
+        if role not in ROLES:
+            raise ValueError(f"Unknown gesture role: {role}")
+        self.role = role
+        self.backend = backend if backend is not None else create_backend()
         # Get screen size
-        self.screen_width, self.screen_height = pyautogui.size()
+        self.screen_width, self.screen_height = self.backend.size()
         self.smoothing = smoothing
         self.sensitivity = sensitivity
         self.dead_zone = dead_zone
@@ -33,26 +47,56 @@ class GestureController:
         self.is_dragging = False
         self.prev_scroll_y = None
         self.is_scrolling = False
-        self.x_history = deque(maxlen=self.smoothing_window)
-        self.y_history = deque(maxlen=self.smoothing_window)
+        self.filter_min_cutoff = filter_min_cutoff
+        self.filter_beta = filter_beta
+        self.last_timestamp = None
+        self.set_filter(filter_type)
+        # Optional CursorInterpolator that moves the cursor at display rate
+        self.interpolator = None
+        # Optional KineticScroller that smooths scrolling and adds inertia
+        self.scroller = None
+        self._own_features = HandFeatures(max_num_hands=1)
+        self.features = self._own_features
+        self.hand_index = 0
+
+    def set_filter(self, filter_type):
+        """Selects the cursor smoothing filter: one_euro, kalman or moving_average."""
+        if filter_type not in FILTERS:
+            print(f"Unknown filter type {filter_type!r}, using one_euro.")
+            filter_type = "one_euro"
+        if filter_type == "one_euro":
+            params = {"min_cutoff": self.filter_min_cutoff, "beta": self.filter_beta}
+        elif filter_type == "moving_average":
+            params = {"window": self.smoothing_window}
+        else:
+            params = {}
+        self.cursor_filter = PointFilter(filter_type, **params)
+        self.filter_type = filter_type
 
-    def move_cursor_with_hand(self, hand_landmarks):
-        if not hand_landmarks or len(hand_landmarks) < 9:
+    def move_cursor_with_hand(self, hand_landmarks, timestamp=None):
+        if hand_landmarks is None or len(hand_landmarks) < 9:
             print("No hand landmarks or not enough landmarks detected.")
             return
-        x_norm, y_norm, _ = hand_landmarks[8]
-        # Dead zone: ignore small movements
-        if self.prev_x is not None and self.prev_y is not None:
+        x_norm = float(hand_landmarks[INDEX_TIP, 0])
+        y_norm = float(hand_landmarks[INDEX_TIP, 1])
+        if timestamp is None:
+            timestamp = time.monotonic()
+        # Restart smoothing after the hand was lost for a while
+        if self.last_timestamp is not None and timestamp - self.last_timestamp > 0.5:
+            self.cursor_filter.reset()
+        self.last_timestamp = timestamp
+        # Dead zone: ignore small movements (the adaptive filters smooth
+        # jitter themselves instead of freezing the cursor)
+        if self.filter_type == "moving_average" and self.prev_x is not None and self.prev_y is not None:
             prev_x_norm = self.prev_x / self.screen_width
             prev_y_norm = self.prev_y / self.screen_height
             dx = abs(x_norm - prev_x_norm)
             dy = abs(y_norm - prev_y_norm)
             if dx < self.dead_zone and dy < self.dead_zone:
-                print(f"In dead zone: dx={dx:.4f}, dy={dy:.4f}, dead_zone={self.dead_zone}")
                 return
         # Sensitivity
-        x_norm = np.clip(x_norm * self.sensitivity, 0, 1)
-        y_norm = np.clip(y_norm * self.sensitivity, 0, 1)
+        x_norm = min(max(x_norm * self.sensitivity, 0.0), 1.0)
+        y_norm = min(max(y_norm * self.sensitivity, 0.0), 1.0)
         # Edge boosting
         edge_margin = 0.05
         if x_norm < edge_margin:
@@ -67,87 +111,116 @@ class GestureController:
         elif y_norm > 1 - edge_margin:
             y_norm += (y_norm - (1 - edge_margin)) * (self.edge_boost_factor - 1)
             y_norm = min(1, y_norm)
-        # Convert normalized coordinates to screen coordinates
-        x = int(x_norm * self.screen_width)
-        y = int(y_norm * self.screen_height)
-        # Moving average smoothing
-        self.x_history.append(x)
-        self.y_history.append(y)
-        smooth_x = int(np.mean(self.x_history))
-        smooth_y = int(np.mean(self.y_history))
-        print(f"Moving cursor to: {smooth_x}, {smooth_y}")
-        pyautogui.moveTo(smooth_x, smooth_y)
+        # Convert normalized coordinates to screen coordinates and smooth
+        fx, fy = self.cursor_filter.filter(x_norm * self.screen_width, y_norm * self.screen_height, timestamp)
+        smooth_x = int(fx)
+        smooth_y = int(fy)
+        if self.interpolator is not None:
+            self.interpolator.push_target(smooth_x, smooth_y, timestamp)
+        else:
+            self.backend.move_to(smooth_x, smooth_y)
         self.prev_x, self.prev_y = smooth_x, smooth_y
 
+    def snap_cursor(self):
+        # Clicks must land exactly where the user aimed, not at an
+        # interpolated position
+        if self.interpolator is not None and self.prev_x is not None:
+            self.interpolator.snap(self.prev_x, self.prev_y)
+
     def detect_pinch(self, hand_landmarks, finger_tip_idx=8, threshold=None):
         """
         Detects a pinch gesture (thumb tip and index finger tip close together).
+        Reads the distance computed by the current frame's feature pass.
         Returns True if pinch is detected, else False.
         """
-        if not hand_landmarks or len(hand_landmarks) <= max(4, finger_tip_idx):
+        if hand_landmarks is None or len(hand_landmarks) <= max(4, finger_tip_idx):
             return False
-        thumb_tip = np.array(hand_landmarks[4][:2])
-        finger_tip = np.array(hand_landmarks[finger_tip_idx][:2])
-        dist = np.linalg.norm(thumb_tip - finger_tip)
+        dist = self.features.pinch_distance(self.hand_index, finger_tip_idx)
         if threshold is None:
             threshold = self.pinch_threshold
-        if dist < threshold:
-            print(f"Pinch detected! Thumb-{finger_tip_idx} Distance: {dist:.4f}")
-            return True
-        else:
-            print(f"No pinch. Thumb-{finger_tip_idx} Distance: {dist:.4f}")
-            return False
+        return dist < threshold
 
-    def detect_scroll(self, hand_landmarks):
+    def detect_scroll(self, hand_landmarks, timestamp=None):
         # Use index (8) and middle (12) finger tips for two-finger scroll
-        if not hand_landmarks or len(hand_landmarks) < 13:
-            self.is_scrolling = False
+        if hand_landmarks is None or len(hand_landmarks) < 13:
+            self.stop_scrolling()
             self.prev_scroll_y = None
             return
-        index_tip = hand_landmarks[8][1]
-        middle_tip = hand_landmarks[12][1]
-        avg_y = (index_tip + middle_tip) / 2
+        avg_y = float(self.features.scroll_y[self.hand_index])
         if self.prev_scroll_y is not None:
             dy = avg_y - self.prev_scroll_y
             if abs(dy) > self.scroll_threshold:
-                scroll_amount = int(-dy * self.scroll_sensitivity)
-                pyautogui.scroll(scroll_amount)
-                print(f"Scroll: {scroll_amount}")
+                scroll_amount = -dy * self.scroll_sensitivity
+                if self.scroller is not None:
+                    self.scroller.push(scroll_amount, timestamp)
+                else:
+                    self.backend.scroll(int(scroll_amount))
                 self.is_scrolling = True
             else:
-                self.is_scrolling = False
+                self.stop_scrolling()
         self.prev_scroll_y = avg_y
 
-    def process_hand(self, hand_landmarks):
+    def stop_scrolling(self):
+        if self.is_scrolling and self.scroller is not None:
+            self.scroller.release()
+        self.is_scrolling = False
+
+    def process_hand(self, hand_landmarks, features=None, hand_index=0, timestamp=None):
         """
-        Moves cursor and handles click based on hand landmarks.
+        Moves cursor and handles click based on a (21, 3) landmark array.
+        features may be a HandFeatures already updated for this frame, with
+        hand_index selecting this hand's row; otherwise they are computed here.
+        timestamp is the frame's capture time in time.monotonic() seconds.
         """
-        self.move_cursor_with_hand(hand_landmarks)
+        if features is None:
+            features = self._own_features
+            hand_index = 0
+            if hand_landmarks is not None:
+                features.update(hand_landmarks[np.newaxis])
+        self.features = features
+        self.hand_index = hand_index
+        if self.role == "scroll":
+            self.detect_scroll(hand_landmarks, timestamp)
+            return
+        self.move_cursor_with_hand(hand_landmarks, timestamp)
         # Left click (index pinch)
-        pinching = self.detect_pinch(hand_landmarks, finger_tip_idx=8, threshold=self.pinch_threshold)
+        pinching = self.detect_pinch(hand_landmarks, finger_tip_idx=INDEX_TIP, threshold=self.pinch_threshold)
         # Right click (middle pinch)
-        right_pinching = self.detect_pinch(hand_landmarks, finger_tip_idx=12, threshold=self.right_pinch_threshold)
+        right_pinching = self.detect_pinch(hand_landmarks, finger_tip_idx=MIDDLE_TIP, threshold=self.right_pinch_threshold)
         # Drag (maintain pinch)
         if pinching and not self.is_pinching:
-            pyautogui.mouseDown()
+            self.snap_cursor()
+            self.backend.mouse_down()
             print("Left drag start!")
             self.is_pinching = True
             self.is_dragging = True
         elif not pinching and self.is_pinching:
-            pyautogui.mouseUp()
+            self.backend.mouse_up()
             print("Left drag end!")
             self.is_pinching = False
             self.is_dragging = False
         # Right click (on pinch, not hold)
         if right_pinching and not self.is_right_pinching:
-            pyautogui.rightClick()
+            self.snap_cursor()
+            self.backend.right_click()
             print("Right click!")
             self.is_right_pinching = True
         elif not right_pinching and self.is_right_pinching:
             print("Right pinch released.")
             self.is_right_pinching = False
         # Scroll (two-finger vertical movement)
-        self.detect_scroll(hand_landmarks)
+        self.detect_scroll(hand_landmarks, timestamp)
+        # Inject the frame's coalesced cursor move
+        self.backend.flush()
+
+    def release_drag(self):
+        # A lost hand ends any scroll gesture; a fling keeps coasting
+        self.stop_scrolling()
+        # Always release mouse if dragging
+        if self.is_dragging:
+            self.backend.mouse_up()
+            self.is_pinching = False
+            self.is_dragging = False
 
     def reset(self):
         self.prev_x = None
@@ -157,7 +230,11 @@ class GestureController:
         self.is_dragging = False
         self.prev_scroll_y = None
         self.is_scrolling = False
+        if self.scroller is not None:
+            self.scroller.halt()
+        self.last_timestamp = None
+        self.cursor_filter.reset()
 
-    def recognize_gesture(self, hand_landmarks):
+    def recognize_gesture(self, hand_landmarks, features=None, hand_index=0, timestamp=None):
         # For compatibility; delegates to process_hand
-        self.process_hand(hand_landmarks) 
\ No newline at end of file
+        self.process_hand(hand_landmarks, features, hand_index, timestamp) 
\ No newline at end of file
@@ -1,66 +1,165 @@
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QPushButton, QVBoxLayout, QHBoxLayout,
-    QLabel, QSlider, QCheckBox, QGroupBox, QFormLayout, QSpinBox, QMessageBox, QDoubleSpinBox, QStatusBar
+    QLabel, QSlider, QCheckBox, QGroupBox, QFormLayout, QSpinBox, QMessageBox, QDoubleSpinBox, QStatusBar, QComboBox, QFileDialog
 )
-from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import QImage, QPixmap, QKeySequence, QCloseEvent, QShortcut
-import cv2
+from PySide6.QtCore import Qt, QObject, Signal, QTimer
+from PySide6.QtGui import QKeySequence, QCloseEvent, QShortcut
 import sys
 import logging
-import json
-import os
-import time
-from src.hand_tracker import HandTracker
-from src.gesture_controller import GestureController
-from src.voice_controller import VoiceController
-import pyautogui
+import threading
+from src.pipeline import TrackingPipeline
+from src.preview import PreviewWidget
+from src.input_backend import create_backend
+from src.metrics import PipelineMetrics
+from src.scheduler import IDLE
+from src.recording import LandmarkRecorder
+from src.config_store import ConfigStore, DEFAULT_CONFIG_PATH, apply_live_options
+from src.components import create_hand_tracker, create_controllers, create_scheduler, create_associator
+from src.capture_profile import store_profile
+from src.startup import STARTUP
 
 APP_NAME = "Invisible Mouse - Hand & Voice Control"
-CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config.json')
+CONFIG_PATH = DEFAULT_CONFIG_PATH
 
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
 
-def load_config():
-    if os.path.exists(CONFIG_PATH):
-        try:
-            with open(CONFIG_PATH, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            logging.error(f"Failed to load config: {e}")
-    return {}
+class PipelineSignals(QObject):
+    # Emitted from pipeline worker threads; delivered on the GUI thread
+    hand_status = Signal(bool)
+    failed = Signal(str)
+
+class TrackerSignals(QObject):
+    # Emitted from the warm-up thread: outputs_ready with (backend,
+    # controllers, interpolator, scrollers) once input injection is set up,
+    # then ready once the camera and model are loaded, with the new capture
+    # profile entry to store (or None)
+    outputs_ready = Signal(object)
+    ready = Signal(object, object)
+    failed = Signal(str)
 
-def save_config(config):
-    try:
-        with open(CONFIG_PATH, 'w') as f:
-            json.dump(config, f, indent=2)
-    except Exception as e:
-        logging.error(f"Failed to save config: {e}")
+class ConfigSignals(QObject):
+    # Emitted from the config store thread when config.json is edited externally
+    config_changed = Signal(dict)
 
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle(APP_NAME)
         QApplication.setApplicationName(APP_NAME)
-        self.config = load_config()
+        self.config = ConfigStore(CONFIG_PATH)
         screen = QApplication.primaryScreen().geometry()
         self.PREVIEW_WIDTH = int(screen.width() * 0.8)
         self.PREVIEW_HEIGHT = int(screen.height() * 0.6)  # 60% height
-        try:
-            self.hand_tracker = HandTracker(frame_width=self.PREVIEW_WIDTH, frame_height=self.PREVIEW_HEIGHT)
-        except RuntimeError as e:
-            self.show_camera_error(str(e))
-            self.hand_tracker = None
-        self.gesture_controller = GestureController()
-        self.voice_controller = VoiceController()
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_hand_tracking)
+        # Created by the warm-up thread; the window shows without waiting for
+        # them. The input backend may import pyautogui, which is slow too.
+        self.hand_tracker = None
+        self.input_backend = None
+        self.hand_controllers = []
+        self.gesture_controller = None
+        self.cursor_interpolator = None
+        self.scrollers = []
+        refresh_rate = QApplication.primaryScreen().refreshRate() or 60.0
+        # Created when voice control is first enabled
+        self.voice_controller = None
+        self.signals = PipelineSignals()
+        self.signals.hand_status.connect(self.update_hand_status)
+        self.signals.failed.connect(self.on_pipeline_failed)
+        self.metrics = PipelineMetrics()
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self.update_metrics_panel)
         self.init_ui()
+        self.preview_widget.metrics = self.metrics
+        self.scheduler = create_scheduler(self.config)
+        self.pipeline = None
         self.setup_shortcuts()
         self.restore_preferences()
+        self.config_signals = ConfigSignals()
+        self.config_signals.config_changed.connect(self.apply_config_changes)
+        self.config.add_listener(self.config_signals.config_changed.emit)
         self.is_tracking = False
         self.is_dragging = False
+        self.start_pending = False
+        self.closing = False
         self.resize(self.PREVIEW_WIDTH, self.PREVIEW_HEIGHT + 120)
         self.move(int(screen.width() * 0.1), int(screen.height() * 0.1))
+        self.tracker_signals = TrackerSignals()
+        self.tracker_signals.outputs_ready.connect(self.on_outputs_ready)
+        self.tracker_signals.ready.connect(self.on_tracker_ready)
+        self.tracker_signals.failed.connect(self.on_tracker_failed)
+        # Cleared on the GUI thread, when the result of the warm-up arrives
+        self.tracker_loading = True
+        threading.Thread(target=self.warm_up_tracker, args=(refresh_rate,), name="tracker-warm-up",
+                         daemon=True).start()
+        STARTUP.mark("window created")
+
+    def warm_up_tracker(self, refresh_rate):
+        # Runs off the GUI thread: opening the camera, loading the model and
+        # the first inference take seconds. The probed capture profile is
+        # stored on the GUI thread, which owns the config.
+        entries = []
+        try:
+            backend = create_backend(self.config['input_backend'])
+            controllers, interpolator, scrollers = create_controllers(self.config, backend, refresh_rate)
+            self.tracker_signals.outputs_ready.emit((backend, controllers, interpolator, scrollers))
+            tracker = create_hand_tracker(
+                self.config, self.PREVIEW_WIDTH, self.PREVIEW_HEIGHT,
+                on_profile=lambda key, value: entries.append((key, value))
+            )
+            tracker.warm_up()
+        except Exception as e:
+            self.tracker_signals.failed.emit(str(e))
+            return
+        STARTUP.mark("first inference")
+        self.tracker_signals.ready.emit(tracker, entries[0] if entries else None)
+
+    def on_outputs_ready(self, outputs):
+        backend, controllers, interpolator, scrollers = outputs
+        if self.closing:
+            backend.close()
+            return
+        self.input_backend = backend
+        self.hand_controllers = controllers
+        self.gesture_controller = controllers[0]
+        self.cursor_interpolator = interpolator
+        self.scrollers = scrollers
+        self.toggle_drag_mode(self.drag_mode_toggle.isChecked())
+        if self.voice_toggle.isChecked():
+            # Enabled before there was a backend to type with
+            self.toggle_voice_control(None)
+
+    def on_tracker_ready(self, tracker, entry):
+        self.tracker_loading = False
+        if self.closing:
+            # The window closed during the warm-up
+            tracker.release()
+            return
+        if entry is not None:
+            store_profile(self.config, *entry)
+        self.hand_tracker = tracker
+        self.pipeline = TrackingPipeline(
+            tracker, self.gesture_controller,
+            on_frame=self.preview_widget.submit,
+            on_hands=self.signals.hand_status.emit,
+            on_error=self.signals.failed.emit,
+            metrics=self.metrics,
+            scheduler=self.scheduler,
+            controllers=self.hand_controllers,
+            associator=create_associator(self.config, tracker.max_num_hands)
+        )
+        logging.info(f"Hand tracker ready {STARTUP.elapsed('first inference'):.2f} s after start")
+        if self.start_pending:
+            self.start_pending = False
+            self.start_hand_tracking()
+        else:
+            self.status.showMessage("Ready.")
+
+    def on_tracker_failed(self, message):
+        self.tracker_loading = False
+        self.start_pending = False
+        if self.closing:
+            return
+        self.status.showMessage("Camera not available.")
+        self.show_camera_error(message)
 
     def init_ui(self):
         # Controls
@@ -70,15 +169,20 @@ class MainWindow(QMainWindow):
         self.drag_mode_toggle = QCheckBox("Enable Drag Mode (Pinch Hold)")
         self.drag_mode_toggle.setChecked(True)
         self.drag_mode_toggle.stateChanged.connect(self.toggle_drag_mode)
-        self.preview_label = QLabel()
-        self.preview_label.setFixedSize(self.PREVIEW_WIDTH, self.PREVIEW_HEIGHT)
-        self.preview_label.setStyleSheet("background: #222; border: 2px solid #444;")
+        self.preview_widget = PreviewWidget(
+            self.PREVIEW_WIDTH, self.PREVIEW_HEIGHT,
+            max_fps=self.config['preview_fps'],
+            enabled=self.config['preview_enabled']
+        )
+        self.preview_toggle = QCheckBox("Show Preview")
+        self.preview_toggle.setChecked(self.preview_widget.enabled)
+        self.preview_toggle.stateChanged.connect(self.toggle_preview)
         self.sensitivity_slider = QSlider(Qt.Horizontal)
         self.sensitivity_slider.setMinimum(1)
         self.sensitivity_slider.setMaximum(300)
-        self.sensitivity_slider.setValue(int(self.gesture_controller.sensitivity * 100))
+        self.sensitivity_slider.setValue(int(self.config['sensitivity'] * 100))
         self.sensitivity_slider.valueChanged.connect(self.update_sensitivity)
-        self.sensitivity_label = QLabel(f"Sensitivity: {self.gesture_controller.sensitivity:.2f}")
+        self.sensitivity_label = QLabel(f"Sensitivity: {self.config['sensitivity']:.2f}")
 
         # Settings panel for gesture thresholds
         self.settings_group = QGroupBox("Gesture Thresholds")
@@ -86,30 +190,57 @@ class MainWindow(QMainWindow):
         self.pinch_spin = QDoubleSpinBox()
         self.pinch_spin.setDecimals(3)
         self.pinch_spin.setRange(0.01, 0.2)
-        self.pinch_spin.setValue(self.gesture_controller.pinch_threshold)
+        self.pinch_spin.setValue(self.config['pinch_threshold'])
         self.pinch_spin.valueChanged.connect(self.update_pinch_threshold)
         self.right_pinch_spin = QDoubleSpinBox()
         self.right_pinch_spin.setDecimals(3)
         self.right_pinch_spin.setRange(0.01, 0.2)
-        self.right_pinch_spin.setValue(self.gesture_controller.right_pinch_threshold)
+        self.right_pinch_spin.setValue(self.config['right_pinch_threshold'])
         self.right_pinch_spin.valueChanged.connect(self.update_right_pinch_threshold)
         settings_layout.addRow("Pinch (Left Click):", self.pinch_spin)
+        self.filter_combo = QComboBox()
+        self.filter_combo.addItem("One-Euro (adaptive)", "one_euro")
+        self.filter_combo.addItem("Kalman (constant velocity)", "kalman")
+        self.filter_combo.addItem("Moving average", "moving_average")
+        self.filter_combo.setCurrentIndex(self.filter_combo.findData(self.config['filter_type']))
+        self.filter_combo.currentIndexChanged.connect(self.update_filter_type)
         settings_layout.addRow("Pinch (Right Click):", self.right_pinch_spin)
+        settings_layout.addRow("Cursor Smoothing:", self.filter_combo)
         self.settings_group.setLayout(settings_layout)
 
+        # Debug panel with per-stage pipeline timings
+        self.metrics_toggle = QCheckBox("Show Pipeline Metrics")
+        self.metrics_toggle.stateChanged.connect(self.toggle_metrics_panel)
+        self.metrics_group = QGroupBox("Pipeline Metrics")
+        metrics_layout = QVBoxLayout()
+        self.metrics_label = QLabel()
+        self.metrics_label.setStyleSheet("font-family: monospace;")
+        self.export_metrics_btn = QPushButton("Export Metrics...")
+        self.export_metrics_btn.clicked.connect(self.export_metrics)
+        self.record_btn = QPushButton("Record Landmarks...")
+        self.record_btn.clicked.connect(self.toggle_recording)
+        metrics_layout.addWidget(self.metrics_label)
+        metrics_layout.addWidget(self.export_metrics_btn)
+        metrics_layout.addWidget(self.record_btn)
+        self.metrics_group.setLayout(metrics_layout)
+        self.metrics_group.setVisible(False)
+
         # Layouts
         controls_layout = QHBoxLayout()
         controls_layout.addWidget(self.start_btn)
         controls_layout.addWidget(self.stop_btn)
         controls_layout.addWidget(self.voice_toggle)
         controls_layout.addWidget(self.drag_mode_toggle)
+        controls_layout.addWidget(self.preview_toggle)
+        controls_layout.addWidget(self.metrics_toggle)
         controls_layout.addWidget(self.sensitivity_label)
         controls_layout.addWidget(self.sensitivity_slider)
 
         main_layout = QVBoxLayout()
         main_layout.addLayout(controls_layout)
-        main_layout.addWidget(self.preview_label)
+        main_layout.addWidget(self.preview_widget)
         main_layout.addWidget(self.settings_group)
+        main_layout.addWidget(self.metrics_group)
 
         container = QWidget()
         container.setLayout(main_layout)
@@ -118,7 +249,7 @@ class MainWindow(QMainWindow):
         # Status bar for live feedback
         self.status = QStatusBar()
         self.setStatusBar(self.status)
-        self.status.showMessage("Ready.")
+        self.status.showMessage("Loading camera and hand model...")
 
         # Connect signals
         self.start_btn.clicked.connect(self.start_hand_tracking)
@@ -158,98 +289,190 @@ class MainWindow(QMainWindow):
         msg.exec()
 
     def toggle_drag_mode(self, state):
-        self.gesture_controller.drag_mode = bool(state)
+        if self.gesture_controller is not None:
+            self.gesture_controller.drag_mode = bool(state)
 
     def start_hand_tracking(self):
         if not self.hand_tracker:
-            self.show_camera_error("Camera is not available.")
+            if self.tracker_loading:
+                # Starts from on_tracker_ready
+                self.start_pending = True
+                self.status.showMessage("Starting hand tracking once the camera is ready...")
+            else:
+                self.show_camera_error("Camera is not available.")
             return
         if self.is_tracking:
             return
         self.status.showMessage("Starting hand tracking...")
         self.is_tracking = True
-        self.timer.start(1000 // 60)  # 60 FPS for ultra-smooth video
+        if self.cursor_interpolator:
+            self.cursor_interpolator.start()
+        for scroller in self.scrollers:
+            scroller.start()
+        self.pipeline.start()
 
     def stop_hand_tracking(self):
+        self.start_pending = False
         if not self.is_tracking:
             return
         self.status.showMessage("Hand tracking stopped.")
         self.is_tracking = False
-        self.timer.stop()
-        # Always release mouse if dragging
-        if self.gesture_controller.is_dragging:
-            pyautogui.mouseUp()
-            self.gesture_controller.is_dragging = False
-
-    def update_hand_tracking(self):
-        if not self.is_tracking or not self.hand_tracker:
+        self.pipeline.stop()
+        if self.cursor_interpolator:
+            self.cursor_interpolator.stop()
+        for scroller in self.scrollers:
+            scroller.stop()
+        self.preview_widget.clear()
+
+    def on_pipeline_failed(self, message):
+        logging.error(f"Hand tracking stopped: {message}")
+        self.stop_hand_tracking()
+        self.status.showMessage(f"Hand tracking stopped: {message}")
+
+    def toggle_preview(self, state):
+        self.preview_widget.set_enabled(bool(state))
+        self.save_preferences()
+
+    def update_hand_status(self, detected):
+        if not self.is_tracking:
             return
-        hand_landmarks_list, frame = self.hand_tracker.get_hand_landmarks(return_frame=True)
-        if frame is not None:
-            label_size = self.preview_label.size()
-            frame = cv2.resize(frame, (label_size.width(), label_size.height()), interpolation=cv2.INTER_LINEAR)
-            rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, ch = rgb_image.shape
-            bytes_per_line = ch * w
-            qt_image = QImage(rgb_image.data, w, h, bytes_per_line, QImage.Format_RGB888)
-            self.preview_label.setPixmap(QPixmap.fromImage(qt_image))
-        if hand_landmarks_list:
-            self.gesture_controller.recognize_gesture(hand_landmarks_list[0])
-            self.status.showMessage("Hand detected.")
+        fps = self.pipeline.fps
+        latency, _ = self.input_backend.latency_stats()
+        stats = f"({fps:.0f} FPS, input {latency:.1f} ms via {self.input_backend.name})"
+        if detected:
+            self.status.showMessage(f"Hand detected. {stats}")
+        elif self.scheduler and self.scheduler.state == IDLE:
+            self.status.showMessage(f"No hand detected, idle. {stats}")
+        else:
+            self.status.showMessage(f"No hand detected. {stats}")
+
+    def toggle_metrics_panel(self, state):
+        visible = bool(state)
+        self.metrics_group.setVisible(visible)
+        if visible:
+            self.update_metrics_panel()
+            self.metrics_timer.start(500)
         else:
-            # If hand lost, always release mouse if dragging
-            if self.gesture_controller.is_dragging:
-                pyautogui.mouseUp()
-                self.gesture_controller.is_dragging = False
-            self.status.showMessage("No hand detected.")
+            self.metrics_timer.stop()
+
+    def update_metrics_panel(self):
+        text = self.metrics.format_summary()
+        if self.hand_tracker and self.hand_tracker.motion_gate:
+            text += "\n\n" + self.hand_tracker.motion_gate.format_summary()
+        if self.scheduler:
+            text += "\n\n" + self.scheduler.format_summary()
+        text += "\n\n" + STARTUP.format_summary()
+        self.metrics_label.setText(text)
+
+    def export_metrics(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Pipeline Metrics", "metrics.json", "JSON (*.json);;CSV (*.csv)"
+        )
+        if not path:
+            return
+        try:
+            self.metrics.export(path)
+            self.status.showMessage(f"Metrics exported to {path}")
+        except OSError as e:
+            logging.error(f"Failed to export metrics: {e}")
+
+    def toggle_recording(self):
+        if not self.pipeline:
+            return
+        if self.pipeline.recorder is not None:
+            recorder = self.pipeline.stop_recording()
+            self.record_btn.setText("Record Landmarks...")
+            self.status.showMessage(f"Recorded {recorder.frames} frames to {recorder.path}")
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Record Landmark Session", "session.lmk", "Landmark recordings (*.lmk)"
+        )
+        if not path:
+            return
+        try:
+            self.pipeline.start_recording(LandmarkRecorder(path, self.hand_tracker.max_num_hands))
+            self.record_btn.setText("Stop Recording")
+        except OSError as e:
+            logging.error(f"Failed to start recording: {e}")
 
     def restore_preferences(self):
-        # Restore sensitivity and thresholds from config
+        # Show the settings from config in the widgets
         try:
-            sens = self.config.get('sensitivity', self.gesture_controller.sensitivity)
-            self.gesture_controller.sensitivity = sens
+            sens = self.config['sensitivity']
             self.sensitivity_slider.setValue(int(sens * 100))
             self.sensitivity_label.setText(f"Sensitivity: {sens:.2f}")
-            pinch = self.config.get('pinch_threshold', self.gesture_controller.pinch_threshold)
-            self.gesture_controller.pinch_threshold = pinch
-            self.pinch_spin.setValue(pinch)
-            right_pinch = self.config.get('right_pinch_threshold', self.gesture_controller.right_pinch_threshold)
-            self.gesture_controller.right_pinch_threshold = right_pinch
-            self.right_pinch_spin.setValue(right_pinch)
+            self.pinch_spin.setValue(self.config['pinch_threshold'])
+            self.right_pinch_spin.setValue(self.config['right_pinch_threshold'])
+            self.filter_combo.setCurrentIndex(self.filter_combo.findData(self.config['filter_type']))
+            self.preview_toggle.setChecked(self.config['preview_enabled'])
         except Exception as e:
             logging.error(f"Failed to restore preferences: {e}")
 
     def save_preferences(self):
-        self.config['sensitivity'] = self.gesture_controller.sensitivity
-        self.config['pinch_threshold'] = self.gesture_controller.pinch_threshold
-        self.config['right_pinch_threshold'] = self.gesture_controller.right_pinch_threshold
-        save_config(self.config)
+        # Cheap: the store only writes changed values, debounced and off the GUI thread
+        self.config['sensitivity'] = self.sensitivity_slider.value() / 100.0
+        self.config['pinch_threshold'] = self.pinch_spin.value()
+        self.config['right_pinch_threshold'] = self.right_pinch_spin.value()
+        self.config['filter_type'] = self.filter_combo.currentData()
+        self.config['preview_enabled'] = self.preview_widget.enabled
+
+    def apply_config_changes(self, changed):
+        restart = apply_live_options(changed, self.hand_controllers, self.hand_tracker)
+        self.restore_preferences()
+        if restart:
+            logging.info(f"Config: {', '.join(sorted(restart))} take effect after a restart")
 
     def update_sensitivity(self, value):
-        self.gesture_controller.sensitivity = value / 100.0
-        self.sensitivity_label.setText(f"Sensitivity: {self.gesture_controller.sensitivity:.2f}")
-        self.save_preferences()
+        self.sensitivity_label.setText(f"Sensitivity: {value / 100.0:.2f}")
+        self.update_option("sensitivity", value / 100.0)
 
     def update_pinch_threshold(self, value):
-        self.gesture_controller.pinch_threshold = value
-        self.save_preferences()
+        self.update_option("pinch_threshold", value)
 
     def update_right_pinch_threshold(self, value):
-        self.gesture_controller.right_pinch_threshold = value
+        self.update_option("right_pinch_threshold", value)
+
+    def update_filter_type(self, index):
+        self.update_option("filter_type", self.filter_combo.itemData(index))
+
+    def update_option(self, key, value):
+        # The controllers may not exist yet; they read config when created
+        apply_live_options({key: value}, self.hand_controllers)
         self.save_preferences()
 
     def toggle_voice_control(self, state):
-        if state == Qt.Checked:
+        # state is a plain int, which never equals the Qt.Checked enum
+        if self.voice_toggle.isChecked():
+            if self.input_backend is None:
+                # Started from on_outputs_ready
+                return
+            if self.voice_controller is None:
+                # Imported here so the speech stack only loads when voice control is used
+                from src.voice_controller import VoiceController
+                self.voice_controller = VoiceController(
+                    engine=self.config['voice_engine'],
+                    model_path=self.config['vosk_model'],
+                    backend=self.input_backend,
+                    text_strategy=self.config['dictation_strategy']
+                )
             self.voice_controller.listen_and_execute()
-        else:
+        elif self.voice_controller is not None:
             self.voice_controller.stop()
 
     def closeEvent(self, event: QCloseEvent):
+        self.closing = True
         if self.is_tracking:
             self.stop_hand_tracking()
-        self.hand_tracker.release()
-        self.voice_controller.stop()
+        if self.pipeline and self.pipeline.recorder is not None:
+            self.toggle_recording()
+        if self.hand_tracker:
+            self.hand_tracker.release()
+        if self.voice_controller is not None:
+            self.voice_controller.close()
+        if self.input_backend is not None:
+            self.input_backend.close()
         self.save_preferences()
+        self.config.close()
         event.accept()
 
 if __name__ == "__main__":
@@ -0,0 +1,138 @@
+import numpy as np
+
+UNKNOWN = -1
+LEFT = 0
+RIGHT = 1
+HANDEDNESS = {"Left": LEFT, "Right": RIGHT}
+
+
+def handedness_code(label):
+    """Maps a MediaPipe handedness label to LEFT, RIGHT or UNKNOWN."""
+    return HANDEDNESS.get(label, UNKNOWN)
+
+
+class HandAssociator:
+    """
+    Gives every detected hand a stable slot from frame to frame, so a slot
+    keeps following the same physical hand even when MediaPipe reorders its
+    results. Hands are matched to the slots' last palm centroids, with a
+    penalty when MediaPipe's handedness disagrees. A slot is held for
+    max_missed frames after its hand disappears, and only a hand within
+    reacquire_distance of where it was last seen can take it over, so a
+    hand appearing elsewhere can't grab slot 0 while the pointer hand is
+    briefly lost. Once the slot 0 hand is gone for longer, the lowest
+    remaining hand is promoted to slot 0. preferred (LEFT or RIGHT) lets a
+    new hand of that handedness claim a free slot 0 first.
+    """
+
+    def __init__(self, max_num_hands=2, max_distance=0.25, handedness_penalty=0.2, max_missed=5, preferred=None,
+                 reacquire_distance=0.5):
+        self.max_num_hands = max_num_hands
+        self.max_distance = max_distance
+        self.reacquire_distance = reacquire_distance
+        self.handedness_penalty = handedness_penalty
+        self.max_missed = max_missed
+        self.preferred = preferred
+        self.centroids = np.zeros((max_num_hands, 2), dtype=np.float32)
+        self.handedness = np.full(max_num_hands, UNKNOWN, dtype=np.int8)
+        self.active = np.zeros(max_num_hands, dtype=bool)
+        self.missed = np.zeros(max_num_hands, dtype=np.int32)
+        # Slots that got a new hand in the last assign()
+        self.started = np.zeros(max_num_hands, dtype=bool)
+        self.slots = np.zeros(max_num_hands, dtype=np.intp)
+        self._cost = np.zeros((max_num_hands, max_num_hands), dtype=np.float32)
+        self._diff = np.zeros((max_num_hands, max_num_hands, 2), dtype=np.float32)
+
+    def assign(self, features, handedness=None):
+        """
+        Returns the slot of each hand in features (a HandFeatures updated
+        for this frame), in detection order. handedness is an optional
+        array of LEFT/RIGHT/UNKNOWN codes per detected hand.
+        """
+        count = features.count
+        slots = self.slots[:count]
+        self.started.fill(False)
+        taken = np.zeros(self.max_num_hands, dtype=bool)
+        assigned = np.zeros(count, dtype=bool)
+        if count and self.active.any():
+            cost = self._cost[:count]
+            diff = self._diff[:count]
+            np.subtract(features.palm_centroid[:count, np.newaxis], self.centroids[np.newaxis], out=diff)
+            np.hypot(diff[..., 0], diff[..., 1], out=cost)
+            if handedness is not None:
+                known = handedness[:count, np.newaxis]
+                mismatch = (known != self.handedness) & (known != UNKNOWN) & (self.handedness != UNKNOWN)
+                cost += mismatch * np.float32(self.handedness_penalty)
+            cost[:, ~self.active] = np.inf
+            # Greedy on ascending cost; optimal for the handful of hands involved
+            for flat in np.argsort(cost, axis=None):
+                i, slot = divmod(int(flat), self.max_num_hands)
+                if cost[i, slot] > self.max_distance:
+                    break
+                if assigned[i] or taken[slot]:
+                    continue
+                slots[i] = slot
+                assigned[i] = taken[slot] = True
+        unassigned = np.flatnonzero(~assigned)
+        if self.preferred is not None and handedness is not None:
+            # New hands of the preferred handedness pick their slot first
+            unassigned = sorted(unassigned, key=lambda i: handedness[i] != self.preferred)
+        for i in unassigned:
+            code = handedness[i] if handedness is not None else UNKNOWN
+            slot, reacquired = self._free_slot(taken, code, features.palm_centroid[i])
+            slots[i] = slot
+            taken[slot] = True
+            # Anything but the slot's own hand coming back is a new hand,
+            # even in a slot that was still held
+            self.started[slot] = not reacquired
+        for i in range(count):
+            slot = slots[i]
+            self.active[slot] = True
+            self.missed[slot] = 0
+            self.centroids[slot] = features.palm_centroid[i]
+            if handedness is not None and handedness[i] != UNKNOWN:
+                self.handedness[slot] = handedness[i]
+        for slot in np.flatnonzero(self.active & ~taken):
+            self.missed[slot] += 1
+            if self.missed[slot] > self.max_missed:
+                self.active[slot] = False
+                self.handedness[slot] = UNKNOWN
+        if not self.active[0] and self.active.any():
+            self._promote(int(np.flatnonzero(self.active)[0]), slots)
+        return slots
+
+    def _free_slot(self, taken, code, centroid):
+        """Returns (slot, reacquired) for a hand no slot matched."""
+        # An unmatched slot that is still held most likely lost its hand to a
+        # move too fast for max_distance; reuse it for a hand that is still
+        # nearby if the handedness fits
+        for slot in np.flatnonzero(self.active & ~taken):
+            dx, dy = self.centroids[slot] - centroid
+            if np.hypot(dx, dy) > self.reacquire_distance:
+                continue
+            if code == UNKNOWN or self.handedness[slot] in (UNKNOWN, code):
+                return int(slot), True
+        free = ~taken & ~self.active
+        if self.preferred is not None and code == self.preferred and free[0]:
+            return 0, False
+        if free.any():
+            return int(np.flatnonzero(free)[0]), False
+        # Every slot is in use or held; take slot 0 from its hand last
+        return int(np.flatnonzero(~taken)[-1]), False
+
+    def _promote(self, source, slots):
+        self.centroids[0] = self.centroids[source]
+        self.handedness[0] = self.handedness[source]
+        self.missed[0] = self.missed[source]
+        self.active[0] = True
+        self.started[0] = True
+        self.active[source] = False
+        self.started[source] = False
+        self.handedness[source] = UNKNOWN
+        slots[slots == source] = 0
+
+    def reset(self):
+        self.active.fill(False)
+        self.started.fill(False)
+        self.missed.fill(0)
+        self.handedness.fill(UNKNOWN)
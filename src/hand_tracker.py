@@ -1,55 +1,272 @@
+import time
 import cv2
-import mediapipe as mp
+import numpy as np
+from src.inference_process import InferenceProcess, FULL_FRAME_GRAPH, ROI_GRAPH
+from src.features import empty_landmarks
+from src.hand_identity import UNKNOWN, handedness_code
+from src.frame_sources import CameraSource
+
+# Landmark arrays are handed to other pipeline stages, so results rotate
+# through enough preallocated slots that none is overwritten while in use.
+LANDMARK_SLOTS = 8
+
 
 class HandTracker:
-    def __init__(self, max_num_hands=2, detection_confidence=0.7, tracking_confidence=0.7, frame_width=640, frame_height=480):
+    """
+    inference_size, when set, runs MediaPipe on a fixed square image of that
+    many pixels instead of the full capture frame. While a hand is tracked
+    the image is a padded crop around the previous landmarks (ROI mode), with
+    a full-frame pass every roi_refresh_interval frames so new hands are
+    still found. Landmarks are always returned in full-frame normalized
+    coordinates. The handedness codes of the hands returned by the last
+    process_frame() are in last_handedness.
+
+    source is a FrameSource; by default camera 0 is opened at
+    frame_width x frame_height. motion_gate, a MotionGate, lets frames where
+    the hand has not moved reuse the previous landmarks.
+    """
+
+    def __init__(self, max_num_hands=2, detection_confidence=0.7, tracking_confidence=0.7, frame_width=640, frame_height=480, inference_mode="thread",
+                 inference_size=None, roi_padding=0.3, roi_refresh_interval=15, source=None,
+                 motion_gate=None):
         self.max_num_hands = max_num_hands
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            max_num_hands=self.max_num_hands,
+        self.inference_mode = inference_mode
+        self.mp_hands = None
+        self.hands = None
+        # Separate graph for ROI crops, created on first use
+        self.roi_hands = None
+        self.hand_options = dict(
+            max_num_hands=max_num_hands,
             min_detection_confidence=detection_confidence,
             min_tracking_confidence=tracking_confidence
         )
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.cap = cv2.VideoCapture(0)
-        if not self.cap.isOpened():
-            raise RuntimeError("Error: Could not open camera.")
-        # Set frame size for performance
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, frame_width)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, frame_height)
-        # Set buffer size to 1 if supported (reduces lag)
-        if hasattr(cv2, 'CAP_PROP_BUFFERSIZE'):
-            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.inference_process = None
+        if inference_mode == "process":
+            # MediaPipe runs in a child process, off this process's GIL
+            self.inference_process = InferenceProcess(
+                max_num_hands=max_num_hands,
+                detection_confidence=detection_confidence,
+                tracking_confidence=tracking_confidence
+            )
+        else:
+            # Imported here: loading mediapipe takes about a second, and the
+            # inference process mode never needs it in this process
+            import mediapipe as mp
+            self.mp_hands = mp.solutions.hands
+            self.hands = self.mp_hands.Hands(**self.hand_options)
+        self.source = source if source is not None else CameraSource(0, frame_width, frame_height)
+        self.last_capture_time = 0.0
+        self.motion_gate = motion_gate
+        self.last_landmarks = None
         self.frame_width = frame_width
         self.frame_height = frame_height
+        self.landmark_buffers = empty_landmarks(max_num_hands, LANDMARK_SLOTS)
+        self.handedness_buffers = np.full((LANDMARK_SLOTS, max_num_hands), UNKNOWN, dtype=np.int8)
+        self.last_handedness = self.handedness_buffers[0, :0]
+        self.landmark_slot = 0
+        self.roi_padding = roi_padding
+        self.roi_refresh_interval = roi_refresh_interval
+        self.set_inference_size(inference_size)
+        # Optional PipelineMetrics for per-stage timing
+        self.metrics = None
 
-    def get_hand_landmarks(self, return_frame=False):
-        # Drop old frames for real-time performance
-        for _ in range(2):
-            self.cap.grab()
-        success, frame = self.cap.read()
-        if not success or frame is None:
-            print("Error: Failed to capture frame from camera.")
-            return ([] if not return_frame else ([], None))
+    def read_frame(self):
+        metrics = self.metrics
+        start = time.perf_counter()
+        frame = self.source.read()
+        if frame is None:
+            print("Error: Failed to capture frame from source.")
+            return None
+        self.last_capture_time = self.source.last_capture_time
+        grabbed = time.perf_counter()
         # Do NOT resize here; use full camera frame for hand tracking
         # Flip the frame for natural interaction
         frame = cv2.flip(frame, 1)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(rgb_frame)
-        hand_landmarks_list = []
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                normalized_landmarks = [
-                    (lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark
-                ]
-                hand_landmarks_list.append(normalized_landmarks)
-                # Draw landmarks for preview
-                self.mp_drawing.draw_landmarks(frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
+        if metrics is not None:
+            metrics.record("grab", grabbed - start)
+            metrics.record("flip", time.perf_counter() - grabbed)
+        return frame
+
+    def set_inference_size(self, inference_size):
+        """Switches the inference input size; None uses the full frame."""
+        self.inference_size = inference_size
+        self.roi = None  # (x0, y0, side) in frame pixels
+        self.frames_since_full = 0
+        self.content_size = None
+        if inference_size:
+            self.inference_bgr = np.zeros((inference_size, inference_size, 3), dtype=np.uint8)
+            self.inference_rgb = np.zeros((inference_size, inference_size, 3), dtype=np.uint8)
+
+    def _next_landmark_buffer(self):
+        slot = self.landmark_slot
+        self.landmark_slot = (slot + 1) % LANDMARK_SLOTS
+        return self.landmark_buffers[slot], self.handedness_buffers[slot]
+
+    def process_frame(self, frame):
+        """
+        Returns a (hands, 21, 3) float32 array of normalized landmarks. The
+        array is a view into a preallocated buffer that is reused after
+        LANDMARK_SLOTS further frames.
+        """
+        out, handedness = self._next_landmark_buffer()
+        metrics = self.metrics
+        start = time.perf_counter()
+        gate = self.motion_gate
+        if gate is not None and self.last_landmarks is not None and gate.is_static(frame):
+            # Hand hasn't moved since the last processed frame
+            count = len(self.last_landmarks)
+            out[:count] = self.last_landmarks
+            handedness[:count] = self.last_handedness
+            self.last_landmarks = out[:count]
+            self.last_handedness = handedness[:count]
+            if metrics is not None:
+                metrics.record("gate", time.perf_counter() - start)
+            return self.last_landmarks
+        transform = None
+        image = frame
+        roi_pass = False
+        if self.inference_size:
+            image, transform, roi_pass = self._prepare_inference_input(frame)
+        if self.inference_process is not None:
+            converted = time.perf_counter()
+            # The child process does its own color conversion
+            landmarks = self.inference_process.process_frame(
+                image, out, handedness, ROI_GRAPH if roi_pass else FULL_FRAME_GRAPH
+            )
+            count = len(landmarks)
+        else:
+            if self.inference_size:
+                rgb_frame = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self.inference_rgb)
+            else:
+                rgb_frame = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+            converted = time.perf_counter()
+            hands = self.hands
+            if roi_pass:
+                # Crops and full frames have different coordinates, which
+                # would break one graph's frame-to-frame tracking
+                if self.roi_hands is None:
+                    self.roi_hands = self.mp_hands.Hands(**self.hand_options)
+                hands = self.roi_hands
+            results = hands.process(rgb_frame)
+            count = 0
+            if results.multi_hand_landmarks:
+                labels = results.multi_handedness or ()
+                for hand_landmarks in results.multi_hand_landmarks[:self.max_num_hands]:
+                    hand = out[count]
+                    for i, lm in enumerate(hand_landmarks.landmark):
+                        hand[i] = (lm.x, lm.y, lm.z)
+                    if count < len(labels):
+                        handedness[count] = handedness_code(labels[count].classification[0].label)
+                    else:
+                        handedness[count] = UNKNOWN
+                    count += 1
+        inferred = time.perf_counter()
+        landmarks = out[:count]
+        if transform is not None:
+            self._map_to_frame(landmarks, transform)
+            self._update_roi(landmarks, frame.shape)
+        if gate is not None:
+            gate.update(frame, landmarks)
+        self.last_landmarks = landmarks
+        self.last_handedness = handedness[:count]
+        if metrics is not None:
+            metrics.record("convert", converted - start)
+            metrics.record("inference", inferred - converted)
+        return landmarks
+
+    def _prepare_inference_input(self, frame):
+        """
+        Resizes the ROI (or the whole frame) into the preallocated square
+        inference buffer, keeping aspect ratio and padding bottom/right.
+        Returns the buffer, the (x0, y0, scale, width, height) transform and
+        whether the image is an ROI crop.
+        """
+        h, w = frame.shape[:2]
+        size = self.inference_size
+        if self.roi is not None and self.frames_since_full < self.roi_refresh_interval:
+            x0, y0, side = self.roi
+            crop = frame[y0:y0 + side, x0:x0 + side]
+            self.frames_since_full += 1
+            roi_pass = True
+        else:
+            roi_pass = False
+            x0 = y0 = 0
+            crop = frame
+            self.frames_since_full = 0
+        ch, cw = crop.shape[:2]
+        scale = size / max(cw, ch)
+        content = (max(1, int(round(cw * scale))), max(1, int(round(ch * scale))))
+        if content != self.content_size:
+            self.inference_bgr.fill(0)
+            self.content_size = content
+        cv2.resize(crop, content, dst=self.inference_bgr[:content[1], :content[0]], interpolation=cv2.INTER_AREA)
+        return self.inference_bgr, (x0, y0, scale, w, h), roi_pass
+
+    def _map_to_frame(self, landmarks, transform):
+        # Landmarks are normalized to the square inference image; map them
+        # back to normalized full-frame coordinates in place
+        x0, y0, scale, w, h = transform
+        # Size of the inference image in frame pixels
+        pixels = self.inference_size / scale
+        landmarks[:, :, 0] *= pixels / w
+        landmarks[:, :, 0] += x0 / w
+        landmarks[:, :, 1] *= pixels / h
+        landmarks[:, :, 1] += y0 / h
+        landmarks[:, :, 2] *= pixels / w
+
+    def _update_roi(self, landmarks, shape):
+        h, w = shape[:2]
+        if len(landmarks) == 0:
+            self.roi = None
+            return
+        xs = landmarks[:, :, 0]
+        ys = landmarks[:, :, 1]
+        x_min, x_max = float(xs.min()) * w, float(xs.max()) * w
+        y_min, y_max = float(ys.min()) * h, float(ys.max()) * h
+        side = max(x_max - x_min, y_max - y_min) * (1.0 + 2.0 * self.roi_padding)
+        side = int(max(side, self.inference_size))
+        if side >= min(w, h):
+            # Hands cover most of the frame; a crop would not save anything
+            self.roi = None
+            return
+        cx = (x_min + x_max) / 2.0
+        cy = (y_min + y_max) / 2.0
+        x0 = int(min(max(cx - side / 2.0, 0), w - side))
+        y0 = int(min(max(cy - side / 2.0, 0), h - side))
+        self.roi = (x0, y0, side)
+
+    def warm_up(self):
+        """
+        Runs one inference so the first real frame doesn't pay for the
+        graph's lazy initialization (or the inference process start). Uses a
+        frame from the source, which also wakes the camera, or a black frame
+        if none arrives. Tracking state is reset afterwards.
+        """
+        frame = self.read_frame()
+        if frame is None:
+            frame = np.zeros((self.frame_height, self.frame_width, 3), dtype=np.uint8)
+        gate = self.motion_gate
+        self.motion_gate = None
+        try:
+            self.process_frame(frame)
+        finally:
+            self.motion_gate = gate
+        self.last_landmarks = None
+        self.last_handedness = self.handedness_buffers[0, :0]
+        self.roi = None
+        self.frames_since_full = 0
+
+    def get_hand_landmarks(self, return_frame=False):
+        frame = self.read_frame()
+        if frame is None:
+            empty = self.landmark_buffers[0, :0]
+            return (empty if not return_frame else (empty, None))
+        hand_landmarks_list = self.process_frame(frame)
         if return_frame:
             return hand_landmarks_list, frame
         return hand_landmarks_list
 
     def release(self):
-        if self.cap.isOpened():
-            self.cap.release()
-        cv2.destroyAllWindows() 
\ No newline at end of file
+        if self.inference_process is not None:
+            self.inference_process.close()
+        self.source.release() 
\ No newline at end of file
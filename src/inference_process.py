@@ -0,0 +1,216 @@
+import multiprocessing as mp_proc
+import queue
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from src.hand_identity import UNKNOWN, handedness_code
+
+NUM_LANDMARKS = 21
+
+# MediaPipe graphs in the worker. Hands tracks landmarks from frame to
+# frame, so ROI crops and full frames, whose coordinates don't line up,
+# each go to their own graph.
+FULL_FRAME_GRAPH = 0
+ROI_GRAPH = 1
+
+
+class SharedFrameRing:
+    """
+    Fixed number of equally shaped numpy arrays backed by one shared memory
+    block. Only slot indices cross the process boundary, never the pixels.
+    """
+
+    def __init__(self, slots, shape, dtype=np.uint8, name=None):
+        self.slots = slots
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        nbytes = slots * int(np.prod(self.shape)) * self.dtype.itemsize
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.buffer = np.ndarray((slots,) + self.shape, dtype=self.dtype, buffer=self.shm.buf)
+        self.next_slot = 0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def write(self, array):
+        slot = self.next_slot
+        if array.shape == self.shape:
+            self.buffer[slot] = array
+        else:
+            # Smaller arrays are packed at the start of a flat slot
+            self.view(slot, array.shape)[...] = array
+        self.next_slot = (slot + 1) % self.slots
+        return slot
+
+    def view(self, slot, shape):
+        count = int(np.prod(shape))
+        return self.buffer[slot].reshape(-1)[:count].reshape(shape)
+
+    def fits(self, shape):
+        return int(np.prod(shape)) <= int(np.prod(self.shape))
+
+    def close(self):
+        self.buffer = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _inference_worker(frame_name, frame_shape, result_name, slots, max_num_hands,
+                      detection_confidence, tracking_confidence, requests, results):
+    frames = landmarks = None
+    try:
+        # Everything that can fail happens here, so the parent hears about it
+        import cv2
+        import mediapipe as mp
+        frames = SharedFrameRing(slots, frame_shape, np.uint8, name=frame_name)
+        landmarks = SharedFrameRing(slots, (max_num_hands, NUM_LANDMARKS, 3), np.float32, name=result_name)
+        options = dict(
+            max_num_hands=max_num_hands,
+            min_detection_confidence=detection_confidence,
+            min_tracking_confidence=tracking_confidence
+        )
+        graphs = [mp.solutions.hands.Hands(**options), None]
+    except Exception as e:
+        for ring in (frames, landmarks):
+            if ring is not None:
+                ring.close()
+        results.put(("error", str(e)))
+        return
+    results.put(("ready", 0))
+    try:
+        while True:
+            request = requests.get()
+            if request is None:
+                break
+            slot, seq, shape, graph = request
+            if graphs[graph] is None:
+                graphs[graph] = mp.solutions.hands.Hands(**options)
+            rgb_frame = cv2.cvtColor(frames.view(slot, shape), cv2.COLOR_BGR2RGB)
+            output = graphs[graph].process(rgb_frame)
+            count = 0
+            handedness = []
+            if output.multi_hand_landmarks:
+                labels = output.multi_handedness or ()
+                for hand_landmarks in output.multi_hand_landmarks[:max_num_hands]:
+                    out = landmarks.buffer[slot, count]
+                    for i, lm in enumerate(hand_landmarks.landmark):
+                        out[i, 0] = lm.x
+                        out[i, 1] = lm.y
+                        out[i, 2] = lm.z
+                    if count < len(labels):
+                        handedness.append(handedness_code(labels[count].classification[0].label))
+                    else:
+                        handedness.append(UNKNOWN)
+                    count += 1
+            results.put((seq, count, tuple(handedness)))
+    finally:
+        for hands in graphs:
+            if hands is not None:
+                hands.close()
+        frames.close()
+        landmarks.close()
+
+
+class InferenceProcess:
+    """
+    Runs MediaPipe Hands in a child process. Frames go in through a shared
+    memory ring and landmark arrays come back the same way.
+    """
+
+    def __init__(self, max_num_hands=2, detection_confidence=0.7, tracking_confidence=0.7,
+                 slots=3, timeout=1.0):
+        self.max_num_hands = max_num_hands
+        self.detection_confidence = detection_confidence
+        self.tracking_confidence = tracking_confidence
+        self.slots = slots
+        self.timeout = timeout
+        self.ctx = mp_proc.get_context("spawn")
+        self.frames = None
+        self.landmarks = None
+        self.process = None
+        self.requests = None
+        self.results = None
+        self.seq = 0
+
+    def start(self, frame_shape):
+        self.frames = SharedFrameRing(self.slots, frame_shape, np.uint8)
+        self.landmarks = SharedFrameRing(self.slots, (self.max_num_hands, NUM_LANDMARKS, 3), np.float32)
+        self.requests = self.ctx.Queue()
+        self.results = self.ctx.Queue()
+        self.process = self.ctx.Process(
+            target=_inference_worker,
+            args=(self.frames.name, self.frames.shape, self.landmarks.name, self.slots,
+                  self.max_num_hands, self.detection_confidence, self.tracking_confidence,
+                  self.requests, self.results),
+            name="hand-inference",
+            daemon=True
+        )
+        self.process.start()
+        while True:
+            try:
+                status, message = self.results.get(timeout=0.5)
+                break
+            except queue.Empty:
+                if not self.process.is_alive():
+                    # Died without reporting, e.g. killed or crashed in native code
+                    status, message = "error", f"exited with code {self.process.exitcode}"
+                    break
+        if status == "error":
+            self.close()
+            raise RuntimeError(f"Error: Inference process failed to start: {message}")
+
+    def process_frame(self, frame, out, handedness=None, graph=FULL_FRAME_GRAPH):
+        """
+        Copies the normalized landmarks for a BGR frame into out, a
+        preallocated (max_num_hands, 21, 3) float32 array, and returns the
+        filled (hands, 21, 3) view of it. handedness, if given, receives the
+        hands' handedness codes. graph is FULL_FRAME_GRAPH or ROI_GRAPH.
+        Raises RuntimeError if the child process dies; the next call starts
+        a new one.
+        """
+        if self.process is None:
+            self.start(frame.shape)
+        elif not self.frames.fits(frame.shape):
+            self.close()
+            self.start(frame.shape)
+        slot = self.frames.write(frame)
+        self.seq += 1
+        self.requests.put((slot, self.seq, frame.shape, graph))
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                # Short waits so a dead child is noticed at once
+                seq, count, codes = self.results.get(timeout=0.1)
+            except queue.Empty:
+                if not self.process.is_alive():
+                    exitcode = self.process.exitcode
+                    self.close()
+                    raise RuntimeError(f"Inference process exited with code {exitcode}")
+                if time.monotonic() < deadline:
+                    continue
+                print("Error: Inference process did not respond.")
+                return out[:0]
+            if seq == self.seq:
+                out[:count] = self.landmarks.buffer[slot, :count]
+                if handedness is not None:
+                    handedness[:count] = codes
+                return out[:count]
+
+    def close(self):
+        if self.process is not None:
+            self.requests.put(None)
+            self.process.join(timeout=2.0)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process = None
+        if self.frames is not None:
+            self.frames.close()
+            self.landmarks.close()
+            self.frames = None
+            self.landmarks = None
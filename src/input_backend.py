@@ -0,0 +1,346 @@
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+
+
+class InputBackend(ABC):
+    """
+    Base class for mouse/keyboard injection. Cursor moves are queued and
+    coalesced so only the last move of a frame is injected on flush();
+    button, scroll and key events flush pending moves first so they land at
+    the right position. Public methods hold self.lock, which callers that
+    drive the backend from several threads can also take around a sequence.
+    """
+
+    name = "base"
+    # True if _type sends a whole string as one batch of events
+    bulk_typing = False
+
+    def __init__(self, latency_window=240):
+        self.lock = threading.RLock()
+        self._pending_move = None
+        self.last_position = None
+        self.coalesced_moves = 0
+        self.latencies = deque(maxlen=latency_window)
+        # Optional PipelineMetrics; injection time is recorded as "output"
+        self.metrics = None
+
+    # Implemented by concrete backends
+    @abstractmethod
+    def size(self):
+        pass
+
+    @abstractmethod
+    def _move(self, x, y):
+        pass
+
+    @abstractmethod
+    def _button(self, button, down):
+        pass
+
+    @abstractmethod
+    def _scroll(self, amount):
+        pass
+
+    @abstractmethod
+    def _press(self, key):
+        pass
+
+    @abstractmethod
+    def _type(self, text):
+        pass
+
+    @abstractmethod
+    def _key(self, key, down):
+        pass
+
+    def _sync(self):
+        pass
+
+    def can_type(self, text):
+        """True if _type can produce every character of text."""
+        return True
+
+    # Public API
+    def move_to(self, x, y):
+        with self.lock:
+            if self._pending_move is not None:
+                self.coalesced_moves += 1
+            self._pending_move = (int(x), int(y))
+
+    def flush(self):
+        with self.lock:
+            if self._pending_move is None:
+                return
+            x, y = self._pending_move
+            self._pending_move = None
+            if (x, y) == self.last_position:
+                self.coalesced_moves += 1
+                return
+            self._timed(self._move, x, y)
+            self.last_position = (x, y)
+
+    def mouse_down(self, button="left"):
+        with self.lock:
+            self.flush()
+            self._timed(self._button, button, True)
+
+    def mouse_up(self, button="left"):
+        with self.lock:
+            self.flush()
+            self._timed(self._button, button, False)
+
+    def click(self, button="left"):
+        with self.lock:
+            self.flush()
+            start = time.perf_counter()
+            self._button(button, True)
+            self._button(button, False)
+            self._sync()
+            elapsed = time.perf_counter() - start
+            self.latencies.append(elapsed)
+            if self.metrics is not None:
+                self.metrics.record("output", elapsed)
+
+    def right_click(self):
+        self.click("right")
+
+    def scroll(self, amount):
+        if not amount:
+            return
+        with self.lock:
+            self.flush()
+            self._timed(self._scroll, int(amount))
+
+    def press(self, key):
+        with self.lock:
+            self.flush()
+            self._timed(self._press, key)
+
+    def typewrite(self, text):
+        with self.lock:
+            self.flush()
+            self._timed(self._type, text)
+
+    def hotkey(self, *keys):
+        """Presses keys in order and releases them in reverse, e.g. hotkey("ctrl", "v")."""
+        with self.lock:
+            self.flush()
+            start = time.perf_counter()
+            for key in keys:
+                self._key(key, True)
+            for key in reversed(keys):
+                self._key(key, False)
+            self._sync()
+            elapsed = time.perf_counter() - start
+            self.latencies.append(elapsed)
+            if self.metrics is not None:
+                self.metrics.record("output", elapsed)
+
+    def _timed(self, fn, *args):
+        start = time.perf_counter()
+        fn(*args)
+        self._sync()
+        elapsed = time.perf_counter() - start
+        self.latencies.append(elapsed)
+        if self.metrics is not None:
+            self.metrics.record("output", elapsed)
+
+    def latency_stats(self):
+        """Returns (mean, max) injection latency in milliseconds."""
+        if not self.latencies:
+            return 0.0, 0.0
+        samples = list(self.latencies)
+        return 1000.0 * sum(samples) / len(samples), 1000.0 * max(samples)
+
+    def close(self):
+        pass
+
+
+class PyAutoGuiBackend(InputBackend):
+    name = "pyautogui"
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        import pyautogui
+        self.pyautogui = pyautogui
+        # Default PAUSE sleeps 100 ms after every call
+        pyautogui.PAUSE = 0
+        pyautogui.MINIMUM_DURATION = 0
+
+    def size(self):
+        return tuple(self.pyautogui.size())
+
+    def _move(self, x, y):
+        self.pyautogui.moveTo(x, y, _pause=False)
+
+    def _button(self, button, down):
+        if down:
+            self.pyautogui.mouseDown(button=button, _pause=False)
+        else:
+            self.pyautogui.mouseUp(button=button, _pause=False)
+
+    def _scroll(self, amount):
+        self.pyautogui.scroll(amount, _pause=False)
+
+    def _press(self, key):
+        self.pyautogui.press(key, _pause=False)
+
+    def _type(self, text):
+        self.pyautogui.typewrite(text, interval=0, _pause=False)
+
+    def _key(self, key, down):
+        if down:
+            self.pyautogui.keyDown(key, _pause=False)
+        else:
+            self.pyautogui.keyUp(key, _pause=False)
+
+
+class XTestBackend(InputBackend):
+    """Injects events directly through the X11 XTEST extension (python-xlib)."""
+
+    name = "xtest"
+    BUTTONS = {"left": 1, "middle": 2, "right": 3}
+    KEY_NAMES = {
+        "enter": "Return", "tab": "Tab", "space": "space", "backspace": "BackSpace",
+        "ctrl": "Control_L", "shift": "Shift_L", "alt": "Alt_L", "\n": "Return", " ": "space",
+    }
+    bulk_typing = True
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        from Xlib import X, XK, display
+        from Xlib.ext import xtest
+        self.X = X
+        self.XK = XK
+        self.xtest = xtest
+        self.display = display.Display()
+        if not self.display.has_extension("XTEST"):
+            self.display.close()
+            raise RuntimeError("Error: X server has no XTEST extension.")
+        self.screen = self.display.screen()
+
+    def size(self):
+        return self.screen.width_in_pixels, self.screen.height_in_pixels
+
+    def _sync(self):
+        self.display.sync()
+
+    def _move(self, x, y):
+        self.xtest.fake_input(self.display, self.X.MotionNotify, x=x, y=y)
+
+    def _button(self, button, down):
+        event = self.X.ButtonPress if down else self.X.ButtonRelease
+        self.xtest.fake_input(self.display, event, self.BUTTONS[button])
+
+    def _scroll(self, amount):
+        # Buttons 4/5 are wheel up/down, one notch per press
+        button = 4 if amount > 0 else 5
+        for _ in range(abs(amount)):
+            self.xtest.fake_input(self.display, self.X.ButtonPress, button)
+            self.xtest.fake_input(self.display, self.X.ButtonRelease, button)
+
+    def _keysym(self, key):
+        keysym = self.XK.string_to_keysym(self.KEY_NAMES.get(key, key))
+        if not keysym and len(key) == 1:
+            keysym = ord(key)
+        return keysym
+
+    def _keycode(self, key):
+        return self.display.keysym_to_keycode(self._keysym(key))
+
+    def _char_keycode(self, char):
+        """Returns (keycode, needs_shift) for a character, or (0, False)."""
+        keysym = self._keysym(char)
+        keycode = self.display.keysym_to_keycode(keysym)
+        if not keycode:
+            return 0, False
+        return keycode, self.display.keycode_to_keysym(keycode, 0) != keysym
+
+    def can_type(self, text):
+        return all(self._char_keycode(char)[0] for char in set(text))
+
+    def _key(self, key, down):
+        event = self.X.KeyPress if down else self.X.KeyRelease
+        self.xtest.fake_input(self.display, event, self._keycode(key))
+
+    def _press(self, key):
+        keycode = self._keycode(key)
+        self.xtest.fake_input(self.display, self.X.KeyPress, keycode)
+        self.xtest.fake_input(self.display, self.X.KeyRelease, keycode)
+
+    def _type(self, text):
+        # Queued as one batch of events and flushed with a single sync
+        shift = self._keycode("shift")
+        for char in text:
+            keycode, needs_shift = self._char_keycode(char)
+            if not keycode:
+                continue
+            if needs_shift:
+                self.xtest.fake_input(self.display, self.X.KeyPress, shift)
+            self.xtest.fake_input(self.display, self.X.KeyPress, keycode)
+            self.xtest.fake_input(self.display, self.X.KeyRelease, keycode)
+            if needs_shift:
+                self.xtest.fake_input(self.display, self.X.KeyRelease, shift)
+
+    def close(self):
+        self.display.close()
+
+
+class RecordingBackend(InputBackend):
+    """Null backend that records injected events instead of sending them."""
+
+    name = "null"
+
+    def __init__(self, screen_size=(1920, 1080), **kwargs):
+        super().__init__(**kwargs)
+        self.screen_size = screen_size
+        self.events = []
+
+    def size(self):
+        return self.screen_size
+
+    def _move(self, x, y):
+        self.events.append(("move", x, y))
+
+    def _button(self, button, down):
+        self.events.append(("down" if down else "up", button))
+
+    def _scroll(self, amount):
+        self.events.append(("scroll", amount))
+
+    def _press(self, key):
+        self.events.append(("press", key))
+
+    def _type(self, text):
+        self.events.append(("type", text))
+
+    def _key(self, key, down):
+        self.events.append(("keydown" if down else "keyup", key))
+
+
+BACKENDS = {
+    "xtest": XTestBackend,
+    "pyautogui": PyAutoGuiBackend,
+    "null": RecordingBackend,
+}
+
+
+def create_backend(name="auto", **kwargs):
+    """
+    Creates the named backend. "auto" tries XTest on Linux and falls back to
+    pyautogui when python-xlib or an X server is unavailable.
+    """
+    if name != "auto":
+        return BACKENDS[name](**kwargs)
+    candidates = ["pyautogui"]
+    if sys.platform.startswith("linux"):
+        candidates.insert(0, "xtest")
+    for candidate in candidates:
+        try:
+            return BACKENDS[candidate](**kwargs)
+        except Exception as e:
+            print(f"Input backend {candidate} unavailable: {e}")
+    raise RuntimeError("Error: No input backend available.")
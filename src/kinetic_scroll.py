@@ -0,0 +1,130 @@
+import math
+import threading
+import time
+
+
+class KineticScroller:
+    """
+    Turns the per-frame scroll deltas of a two-finger gesture into a steady
+    stream of scroll events at rate_hz. Each delta is spread over the
+    measured camera frame interval, so the page moves at the fingers'
+    velocity instead of jumping once per frame. After release(), or when no
+    delta arrives for two frame intervals, the velocity keeps going and
+    decays by friction per second until it drops below min_velocity.
+
+    Fractional amounts carry over between ticks, so slow scrolls are not
+    rounded away, and each tick injects at most one merged scroll event.
+    The thread sleeps while nothing is scrolling.
+    """
+
+    def __init__(self, backend, rate_hz=120.0, friction=4.0, min_velocity=3.0, max_velocity=6000.0):
+        self.backend = backend
+        self.rate_hz = rate_hz
+        self.friction = friction
+        self.min_velocity = min_velocity
+        self.max_velocity = max_velocity
+        self.cond = threading.Condition()
+        self.velocity = 0.0  # scroll units per second
+        self.remainder = 0.0
+        self.frame_interval = 1.0 / 30
+        self.last_push = None  # capture timestamp, for the frame interval
+        self.last_arrival = None  # monotonic time, for the touch timeout
+        self.touching = False
+        self.pushes = 0
+        self.events = 0
+        self.running = False
+        self.thread = None
+
+    def push(self, amount, timestamp=None):
+        """
+        Adds one frame's scroll amount, in backend scroll units. timestamp is
+        the frame's capture time, on any clock; it defaults to now.
+        """
+        arrival = time.monotonic()
+        if timestamp is None:
+            timestamp = arrival
+        with self.cond:
+            if self.last_push is not None and 0.0 < timestamp - self.last_push < 0.25:
+                self.frame_interval += 0.2 * ((timestamp - self.last_push) - self.frame_interval)
+            self.last_push = timestamp
+            self.last_arrival = arrival
+            velocity = amount / self.frame_interval
+            if self.touching and velocity * self.velocity > 0:
+                # Smooth while the fingers keep moving the same way
+                velocity = self.velocity + 0.5 * (velocity - self.velocity)
+            self.velocity = min(max(velocity, -self.max_velocity), self.max_velocity)
+            self.touching = True
+            self.pushes += 1
+            self.cond.notify()
+
+    def release(self):
+        """Fingers stopped or lifted; the current velocity becomes a fling."""
+        with self.cond:
+            self.touching = False
+
+    def halt(self):
+        with self.cond:
+            self.velocity = 0.0
+            self.remainder = 0.0
+            self.touching = False
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._run, name="scroll-output", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        self.halt()
+
+    def _step(self, dt):
+        """Advances the motion by dt seconds; returns the whole units to inject."""
+        if self.touching and time.monotonic() - self.last_arrival > 2.0 * self.frame_interval:
+            self.touching = False
+        if not self.touching:
+            self.velocity *= math.exp(-self.friction * dt)
+            if abs(self.velocity) < self.min_velocity:
+                self.velocity = 0.0
+                self.remainder = 0.0
+                return 0
+        self.remainder += self.velocity * dt
+        amount = int(self.remainder)
+        self.remainder -= amount
+        return amount
+
+    def _run(self):
+        period = 1.0 / self.rate_hz
+        last = next_tick = time.monotonic()
+        failing = False
+        while self.running:
+            with self.cond:
+                if self.velocity == 0.0:
+                    while self.running and self.velocity == 0.0:
+                        self.cond.wait()
+                    last = next_tick = time.monotonic()
+                now = time.monotonic()
+                amount = self._step(now - last)
+                last = now
+            if amount:
+                try:
+                    with self.backend.lock:
+                        self.backend.scroll(amount)
+                    self.events += 1
+                    failing = False
+                except Exception as e:
+                    if not failing:
+                        print(f"Scroll output error: {e!r}")
+                    failing = True
+            next_tick += period
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.monotonic()
@@ -0,0 +1,138 @@
+import csv
+import json
+import threading
+import time
+from array import array
+from collections import deque
+
+# Stages in pipeline order; unknown stage names are added on first record()
+STAGES = (
+    "grab", "flip", "gate", "convert", "inference", "gesture", "output",
+    "preview_resize", "preview_paint", "draw", "latency",
+)
+
+
+class StageRing:
+    """Fixed-size ring of durations in seconds."""
+
+    def __init__(self, capacity):
+        self.samples = array("d", bytes(8 * capacity))
+        self.capacity = capacity
+        self.index = 0
+        self.count = 0
+
+    def add(self, value):
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def values(self):
+        if self.count < self.capacity:
+            return self.samples[:self.count].tolist()
+        return self.samples.tolist()
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    rank = int(round(pct / 100.0 * (len(sorted_values) - 1)))
+    return sorted_values[rank]
+
+
+class PipelineMetrics:
+    """
+    Low-overhead per-stage timing. Callers take time.perf_counter() around a
+    stage and record() the difference; each stage keeps the last capacity
+    samples. Writers of known stages don't lock, so a summary taken
+    mid-write may be one sample stale. fps() covers the last fps_window
+    seconds of frames.
+    """
+
+    def __init__(self, capacity=1024, fps_window=1.0):
+        self.capacity = capacity
+        self.stages = {name: StageRing(capacity) for name in STAGES}
+        # Guards adding stages and the frame times
+        self.lock = threading.Lock()
+        self.fps_window = fps_window
+        self.frame_times = deque()
+
+    def record(self, stage, duration):
+        ring = self.stages.get(stage)
+        if ring is None:
+            with self.lock:
+                ring = self.stages.setdefault(stage, StageRing(self.capacity))
+        ring.add(duration)
+
+    def mark_frame(self, timestamp=None):
+        if timestamp is None:
+            timestamp = time.monotonic()
+        with self.lock:
+            times = self.frame_times
+            times.append(timestamp)
+            while timestamp - times[0] > self.fps_window:
+                times.popleft()
+
+    def fps(self):
+        """Effective frame rate over the fps_window seconds before the newest frame."""
+        with self.lock:
+            times = self.frame_times
+            if len(times) < 2:
+                return 0.0
+            span = times[-1] - times[0]
+            return (len(times) - 1) / span if span > 0 else 0.0
+
+    def _rings(self):
+        with self.lock:
+            return list(self.stages.items())
+
+    def summary(self):
+        """Returns {stage: {count, mean, p50, p95, p99}} in milliseconds."""
+        result = {}
+        for name, ring in self._rings():
+            values = sorted(ring.values())
+            if not values:
+                continue
+            result[name] = {
+                "count": len(values),
+                "mean": 1000.0 * sum(values) / len(values),
+                "p50": 1000.0 * percentile(values, 50),
+                "p95": 1000.0 * percentile(values, 95),
+                "p99": 1000.0 * percentile(values, 99),
+            }
+        return result
+
+    def format_summary(self):
+        lines = [f"FPS: {self.fps():.1f}", f"{'stage':<16}{'p50':>8}{'p95':>8}{'p99':>8}  ms"]
+        for name, stats in self.summary().items():
+            lines.append(f"{name:<16}{stats['p50']:>8.2f}{stats['p95']:>8.2f}{stats['p99']:>8.2f}")
+        return "\n".join(lines)
+
+    def export_json(self, path):
+        data = {
+            "fps": self.fps(),
+            "summary": self.summary(),
+            "samples_ms": {name: [1000.0 * v for v in ring.values()] for name, ring in self._rings()},
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=2)
+
+    def export_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["stage", "count", "mean_ms", "p50_ms", "p95_ms", "p99_ms"])
+            for name, stats in self.summary().items():
+                writer.writerow([name, stats["count"], f"{stats['mean']:.4f}", f"{stats['p50']:.4f}",
+                                 f"{stats['p95']:.4f}", f"{stats['p99']:.4f}"])
+
+    def export(self, path):
+        if path.lower().endswith(".csv"):
+            self.export_csv(path)
+        else:
+            self.export_json(path)
+
+    def reset(self):
+        for _, ring in self._rings():
+            ring.index = ring.count = 0
+        with self.lock:
+            self.frame_times.clear()
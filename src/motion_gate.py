@@ -0,0 +1,80 @@
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """
+    Decides whether a frame needs a fresh MediaPipe pass. The hand's padded
+    bounding box is downsampled to a small grayscale patch and compared to
+    the patch from the last frame that was actually processed; if fewer than
+    motion_fraction of its pixels changed by more than pixel_threshold, the
+    previous landmarks are reused. At most max_skip frames in a row are
+    skipped so landmarks never get too stale.
+    """
+
+    def __init__(self, pixel_threshold=15, motion_fraction=0.01, max_skip=3, patch_size=48, padding=0.2):
+        self.pixel_threshold = pixel_threshold
+        self.motion_fraction = motion_fraction
+        self.max_skip = max_skip
+        self.patch_size = patch_size
+        self.padding = padding
+        self.patch_bgr = np.zeros((patch_size, patch_size, 3), dtype=np.uint8)
+        self.gray = np.zeros((patch_size, patch_size), dtype=np.uint8)
+        self.diff = np.zeros((patch_size, patch_size), dtype=np.uint8)
+        self.reference = np.zeros((patch_size, patch_size), dtype=np.uint8)
+        self.box = None  # (x0, y0, x1, y1) in frame pixels of the reference
+        self.skipped_in_row = 0
+        self.frames = 0
+        self.skipped = 0
+
+    def _sample(self, frame, out):
+        x0, y0, x1, y1 = self.box
+        cv2.resize(frame[y0:y1, x0:x1], (self.patch_size, self.patch_size), dst=self.patch_bgr,
+                   interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self.patch_bgr, cv2.COLOR_BGR2GRAY, dst=out)
+
+    def is_static(self, frame):
+        """True if frame can reuse the landmarks of the reference frame."""
+        self.frames += 1
+        if self.box is None or self.skipped_in_row >= self.max_skip:
+            return False
+        self._sample(frame, self.gray)
+        cv2.absdiff(self.gray, self.reference, dst=self.diff)
+        cv2.threshold(self.diff, self.pixel_threshold, 255, cv2.THRESH_BINARY, dst=self.diff)
+        moving = cv2.countNonZero(self.diff)
+        if moving > self.motion_fraction * self.diff.size:
+            return False
+        self.skipped_in_row += 1
+        self.skipped += 1
+        return True
+
+    def update(self, frame, landmarks):
+        """Stores frame as the reference for the landmarks just computed from it."""
+        self.skipped_in_row = 0
+        if len(landmarks) == 0:
+            self.box = None
+            return
+        h, w = frame.shape[:2]
+        xs = landmarks[:, :, 0]
+        ys = landmarks[:, :, 1]
+        x_min, x_max = float(xs.min()), float(xs.max())
+        y_min, y_max = float(ys.min()), float(ys.max())
+        pad_x = (x_max - x_min) * self.padding
+        pad_y = (y_max - y_min) * self.padding
+        x0 = int(min(max((x_min - pad_x) * w, 0), w - 1))
+        x1 = int(min(max((x_max + pad_x) * w, x0 + 1), w))
+        y0 = int(min(max((y_min - pad_y) * h, 0), h - 1))
+        y1 = int(min(max((y_max + pad_y) * h, y0 + 1), h))
+        self.box = (x0, y0, x1, y1)
+        self._sample(frame, self.reference)
+
+    @property
+    def skip_rate(self):
+        return self.skipped / self.frames if self.frames else 0.0
+
+    def format_summary(self):
+        return f"{'motion gate':<16}{self.skipped:>8} / {self.frames} frames skipped ({100.0 * self.skip_rate:.0f}%)"
+
+    def reset(self):
+        self.box = None
+        self.skipped_in_row = 0
@@ -0,0 +1,37 @@
+import json
+
+
+class VoskRecognizer:
+    """
+    Offline streaming speech recognition with Vosk. The model is loaded once
+    and reused across start/stop. accept() takes raw 16-bit mono PCM chunks
+    and returns ("partial", text) while a phrase is being spoken,
+    ("final", text) when it ends, or None if nothing changed.
+    """
+
+    def __init__(self, model_path, sample_rate):
+        if not model_path:
+            raise RuntimeError("Error: No Vosk model configured.")
+        try:
+            import vosk
+        except ImportError:
+            raise RuntimeError("Error: Offline recognition needs the vosk package.")
+        vosk.SetLogLevel(-1)
+        self.model = vosk.Model(model_path)
+        self.sample_rate = sample_rate
+        self.recognizer = vosk.KaldiRecognizer(self.model, sample_rate)
+        self.last_partial = ""
+
+    def accept(self, data):
+        if self.recognizer.AcceptWaveform(data):
+            self.last_partial = ""
+            return "final", json.loads(self.recognizer.Result()).get("text", "")
+        partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        if partial == self.last_partial:
+            return None
+        self.last_partial = partial
+        return "partial", partial
+
+    def reset(self):
+        self.recognizer.Reset()
+        self.last_partial = ""
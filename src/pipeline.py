@@ -0,0 +1,250 @@
+import threading
+import time
+from src.features import HandFeatures
+from src.hand_identity import HandAssociator
+from src.metrics import PipelineMetrics
+from src.scheduler import ACTIVE, IDLE
+
+
+class LatestValue:
+    """
+    Bounded single-slot queue. put() never blocks and overwrites an unread
+    item, so consumers always see the newest value and never fall behind.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self._has_item = False
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if self._has_item:
+                self.dropped += 1
+            self._item = item
+            self._has_item = True
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Returns the newest item, or None on timeout or close."""
+        with self._cond:
+            if not self._has_item and not self._closed:
+                self._cond.wait(timeout)
+            if not self._has_item:
+                return None
+            item = self._item
+            self._item = None
+            self._has_item = False
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def reopen(self):
+        with self._cond:
+            self._closed = False
+            self._item = None
+            self._has_item = False
+            self.dropped = 0
+
+
+class FrameResult:
+    __slots__ = ("frame", "landmarks", "capture_time", "handedness")
+
+    def __init__(self, frame, landmarks, capture_time, handedness=None):
+        self.frame = frame
+        self.landmarks = landmarks
+        self.capture_time = capture_time
+        self.handedness = handedness
+
+
+class TrackingPipeline:
+    """
+    Capture -> inference -> gesture engine, each stage on its own thread and
+    connected by LatestValue slots. on_frame(result) is called from the
+    inference thread for preview consumers, on_hands(detected) from the
+    gesture thread. An optional IdleScheduler throttles capture and
+    inference while no hand is present.
+
+    controllers holds one GestureController (or None to ignore the hand)
+    per hand slot of the HandAssociator; by default only gesture_controller
+    in slot 0. All hands' features are computed in one HandFeatures pass.
+
+    An exception in a stage is printed and that frame is skipped. After
+    max_failures frames in a row fail, the stage gives up, error is set and
+    on_error(message) is called from the failing thread; the owner is
+    expected to stop the pipeline.
+    """
+
+    def __init__(self, hand_tracker, gesture_controller, on_frame=None, on_hands=None, metrics=None,
+                 scheduler=None, controllers=None, associator=None, on_error=None, max_failures=50):
+        self.hand_tracker = hand_tracker
+        self.gesture_controller = gesture_controller
+        self.controllers = controllers if controllers is not None else [gesture_controller]
+        self.associator = associator if associator is not None else HandAssociator(hand_tracker.max_num_hands)
+        self.on_frame = on_frame
+        self.on_hands = on_hands
+        self.on_error = on_error
+        self.max_failures = max_failures
+        self.error = None
+        self.frame_slot = LatestValue()
+        self.result_slot = LatestValue()
+        self.features = HandFeatures(hand_tracker.max_num_hands)
+        self.metrics = metrics if metrics is not None else PipelineMetrics()
+        hand_tracker.metrics = self.metrics
+        gesture_controller.backend.metrics = self.metrics
+        self.scheduler = scheduler
+        # Optional LandmarkRecorder fed from the inference thread; swapped
+        # through start/stop_recording so it is never closed mid-write
+        self.recorder = None
+        self.recorder_lock = threading.Lock()
+        self.full_inference_size = hand_tracker.inference_size
+        self.last_capture = 0.0
+        self.running = False
+        self.threads = []
+
+    def start_recording(self, recorder):
+        with self.recorder_lock:
+            self.recorder = recorder
+
+    def stop_recording(self):
+        """Detaches and closes the recorder; returns it, or None if none was set."""
+        with self.recorder_lock:
+            recorder = self.recorder
+            self.recorder = None
+            if recorder is not None:
+                recorder.close()
+        return recorder
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.error = None
+        self.last_capture = 0.0
+        self.frame_slot.reopen()
+        self.result_slot.reopen()
+        if self.scheduler:
+            self.scheduler.reset()
+        self.associator.reset()
+        stages = (("capture", self._capture_step), ("inference", self._inference_step), ("gesture", self._gesture_step))
+        self.threads = [
+            threading.Thread(target=self._run_stage, args=stage, name=stage[0], daemon=True)
+            for stage in stages
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        self.frame_slot.close()
+        self.result_slot.close()
+        for thread in self.threads:
+            thread.join(timeout=2.0)
+        self.threads = []
+        for controller in self.controllers:
+            if controller is not None:
+                controller.release_drag()
+        if self.scheduler and self.scheduler.state == IDLE:
+            self.hand_tracker.set_inference_size(self.full_inference_size)
+
+    def _run_stage(self, name, step):
+        failures = 0
+        while self.running:
+            try:
+                step()
+                failures = 0
+            except Exception as e:
+                failures += 1
+                if failures == 1:
+                    print(f"Pipeline: {name} error: {e!r}")
+                if failures >= self.max_failures:
+                    self.error = f"{name} failed: {e}"
+                    print(f"Pipeline: {self.error}")
+                    if self.on_error:
+                        self.on_error(self.error)
+                    return
+                time.sleep(0.01)
+
+    def _capture_step(self):
+        if self.scheduler:
+            wait = self.last_capture + self.scheduler.frame_interval() - time.monotonic()
+            if wait > 0:
+                # Short sleeps so a switch back to active takes effect quickly
+                time.sleep(min(wait, 0.05))
+                return
+        frame = self.hand_tracker.read_frame()
+        if frame is None:
+            time.sleep(0.01)
+            return
+        self.last_capture = self.hand_tracker.last_capture_time
+        self.frame_slot.put((frame, self.last_capture))
+
+    def _inference_step(self):
+        item = self.frame_slot.get(timeout=0.1)
+        if item is None:
+            return
+        frame, capture_time = item
+        landmarks = self.hand_tracker.process_frame(frame)
+        handedness = self.hand_tracker.last_handedness
+        if self.scheduler:
+            self._update_schedule(len(landmarks) > 0)
+        if self.recorder is not None:
+            with self.recorder_lock:
+                if self.recorder is not None:
+                    self.recorder.write(landmarks, capture_time)
+        result = FrameResult(frame, landmarks, capture_time, handedness)
+        self.result_slot.put(result)
+        if self.on_frame:
+            self.on_frame(result)
+        self.metrics.mark_frame()
+
+    def _gesture_step(self):
+        result = self.result_slot.get(timeout=0.1)
+        if result is None:
+            return
+        start = time.perf_counter()
+        detected = len(result.landmarks) > 0
+        self._dispatch_hands(result)
+        self.metrics.record("gesture", time.perf_counter() - start)
+        self.metrics.record("latency", time.monotonic() - result.capture_time)
+        if self.on_hands:
+            self.on_hands(detected)
+
+    def _dispatch_hands(self, result):
+        landmarks = result.landmarks
+        features = self.features.update(landmarks)
+        slots = self.associator.assign(features, result.handedness)
+        for slot, controller in enumerate(self.controllers):
+            if controller is None:
+                continue
+            hands = (slots == slot).nonzero()[0]
+            if len(hands) == 0:
+                # If hand lost, always release mouse if dragging
+                controller.release_drag()
+                continue
+            if self.associator.started[slot]:
+                # A different hand took over this slot
+                controller.reset()
+            i = int(hands[0])
+            controller.recognize_gesture(landmarks[i], features, i, result.capture_time)
+
+    def _update_schedule(self, detected):
+        state = self.scheduler.update(detected)
+        if state == IDLE:
+            self.full_inference_size = self.hand_tracker.inference_size
+            self.hand_tracker.set_inference_size(self.scheduler.idle_inference_size)
+            print("Pipeline: no hand, entering low-power detection.")
+        elif state == ACTIVE:
+            self.hand_tracker.set_inference_size(self.full_inference_size)
+            print("Pipeline: hand detected, back to full rate.")
+
+    @property
+    def fps(self):
+        return self.metrics.fps()
@@ -0,0 +1,116 @@
+import time
+import cv2
+import numpy as np
+from PySide6.QtWidgets import QWidget
+from PySide6.QtCore import Qt, Signal, QPointF
+from PySide6.QtGui import QImage, QPainter, QPen, QColor
+from src.pipeline import LatestValue
+
+# MediaPipe Hands skeleton, as landmark index pairs
+HAND_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+)
+
+
+class PreviewWidget(QWidget):
+    """
+    Camera preview that consumes pipeline results independently of
+    tracking. submit() may be called from any thread and drops frames
+    beyond max_fps before doing any work; the GUI thread resizes the newest
+    frame into a reused BGR buffer, wraps it in a QImage without color
+    conversion and paints the landmark overlay at preview resolution.
+    """
+
+    frame_ready = Signal()
+
+    def __init__(self, width, height, max_fps=30.0, enabled=True, parent=None):
+        super().__init__(parent)
+        self.setFixedSize(width, height)
+        self.slot = LatestValue()
+        self.enabled = enabled
+        self.set_max_fps(max_fps)
+        self.last_submit = 0.0
+        self.buffer = None
+        self.image = None
+        self.landmarks = None
+        # Optional PipelineMetrics for preview timing
+        self.metrics = None
+        self.frame_ready.connect(self.render_latest)
+
+    def set_max_fps(self, max_fps):
+        self.max_fps = max_fps
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if not enabled:
+            self.clear()
+
+    def clear(self):
+        self.image = None
+        self.landmarks = None
+        self.update()
+
+    def submit(self, result):
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        if now - self.last_submit < self.min_interval:
+            return
+        self.last_submit = now
+        # Landmark buffers are recycled by the tracker, so keep a copy
+        self.slot.put((result.frame, result.landmarks.copy()))
+        self.frame_ready.emit()
+
+    def render_latest(self):
+        item = self.slot.get(timeout=0)
+        if item is None or not self.enabled:
+            return
+        frame, landmarks = item
+        start = time.perf_counter()
+        w, h = self.width(), self.height()
+        if self.buffer is None or self.buffer.shape[:2] != (h, w):
+            self.buffer = np.empty((h, w, 3), dtype=np.uint8)
+        cv2.resize(frame, (w, h), dst=self.buffer, interpolation=cv2.INTER_LINEAR)
+        # Wraps the buffer without copying; it is only rewritten on this thread
+        self.image = QImage(self.buffer.data, w, h, 3 * w, QImage.Format_BGR888)
+        self.landmarks = landmarks
+        if self.metrics is not None:
+            self.metrics.record("preview_resize", time.perf_counter() - start)
+        self.update()
+
+    def paintEvent(self, event):
+        start = time.perf_counter()
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#222"))
+        if self.image is None:
+            painter.setPen(QColor("#888"))
+            text = "Preview" if self.enabled else "Preview disabled"
+            painter.drawText(self.rect(), Qt.AlignCenter, text)
+            painter.end()
+            return
+        painter.drawImage(0, 0, self.image)
+        drawn = time.perf_counter()
+        if self.landmarks is not None and len(self.landmarks):
+            self.draw_overlay(painter)
+        painter.end()
+        if self.metrics is not None:
+            self.metrics.record("preview_paint", drawn - start)
+            self.metrics.record("draw", time.perf_counter() - drawn)
+
+    def draw_overlay(self, painter):
+        w, h = self.width(), self.height()
+        painter.setRenderHint(QPainter.Antialiasing)
+        line_pen = QPen(QColor(255, 255, 255), 2)
+        point_pen = QPen(QColor(255, 0, 0), 6, Qt.SolidLine, Qt.RoundCap)
+        for hand in self.landmarks.tolist():
+            points = [QPointF(x * w, y * h) for x, y, _ in hand]
+            painter.setPen(line_pen)
+            for start, end in HAND_CONNECTIONS:
+                painter.drawLine(points[start], points[end])
+            painter.setPen(point_pen)
+            painter.drawPoints(points)
@@ -0,0 +1,99 @@
+import struct
+import time
+import numpy as np
+from src.features import NUM_LANDMARKS
+
+# File layout: header, then one record per frame.
+#   header: magic (4s), version (H), max_num_hands (B), reserved (B)
+#   record: timestamp in seconds (d), hand count (B), then
+#           count * 21 * 3 little-endian float32 landmarks
+MAGIC = b"IMLM"
+VERSION = 1
+HEADER = struct.Struct("<4sHBB")
+RECORD = struct.Struct("<dB")
+HAND_BYTES = NUM_LANDMARKS * 3 * 4
+
+
+class LandmarkRecorder:
+    """Writes timestamped (hands, 21, 3) landmark arrays to a compact binary file."""
+
+    def __init__(self, path, max_num_hands=2):
+        self.path = path
+        self.max_num_hands = max_num_hands
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, VERSION, max_num_hands, 0))
+        self.frames = 0
+
+    def write(self, landmarks, timestamp=None):
+        if timestamp is None:
+            timestamp = time.monotonic()
+        count = min(len(landmarks), self.max_num_hands)
+        self.file.write(RECORD.pack(timestamp, count))
+        if count:
+            self.file.write(np.ascontiguousarray(landmarks[:count], dtype="<f4").tobytes())
+        self.frames += 1
+
+    def close(self):
+        if not self.file.closed:
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_session(path):
+    """Returns a list of (timestamp, landmarks) with (hands, 21, 3) float32 arrays."""
+    frames = []
+    with open(path, "rb") as f:
+        magic, version, max_num_hands, _ = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"Not a landmark recording: {path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported landmark recording version {version}: {path}")
+        while True:
+            head = f.read(RECORD.size)
+            if len(head) < RECORD.size:
+                break
+            timestamp, count = RECORD.unpack(head)
+            data = f.read(count * HAND_BYTES)
+            if len(data) < count * HAND_BYTES:
+                break  # Truncated final record, e.g. after a crash
+            landmarks = np.frombuffer(data, dtype="<f4").reshape(count, NUM_LANDMARKS, 3).astype(np.float32)
+            frames.append((timestamp, landmarks))
+    return frames
+
+
+class LandmarkReplayer:
+    """
+    Feeds a recorded session into a GestureController. speed is a playback
+    rate relative to the recording (1.0 = real time) or None for as fast as
+    possible.
+    """
+
+    def __init__(self, frames, speed=1.0):
+        self.frames = read_session(frames) if isinstance(frames, str) else frames
+        self.speed = speed
+
+    def __len__(self):
+        return len(self.frames)
+
+    def play(self, controller, on_frame=None):
+        if not self.frames:
+            return 0
+        first = self.frames[0][0]
+        start = time.monotonic()
+        for timestamp, landmarks in self.frames:
+            if self.speed:
+                delay = (timestamp - first) / self.speed - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            if len(landmarks):
+                controller.process_hand(landmarks[0], timestamp=timestamp)
+            else:
+                controller.release_drag()
+            if on_frame:
+                on_frame(timestamp, landmarks)
+        return len(self.frames)
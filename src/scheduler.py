@@ -0,0 +1,73 @@
+import time
+
+ACTIVE = "active"
+IDLE = "idle"
+
+
+class IdleScheduler:
+    """
+    Drops the pipeline to a low-power detection mode after idle_after
+    consecutive frames without a hand: frames are captured at most idle_fps
+    times a second and inference runs at idle_inference_size. The first
+    frame with a hand switches straight back to full rate.
+    """
+
+    def __init__(self, idle_after=30, idle_fps=5.0, idle_inference_size=160):
+        self.idle_after = idle_after
+        self.idle_fps = idle_fps
+        self.idle_inference_size = idle_inference_size
+        self.state = ACTIVE
+        self.empty_frames = 0
+        self.state_since = time.monotonic()
+        self.durations = {ACTIVE: 0.0, IDLE: 0.0}
+        self.transitions = 0
+
+    def update(self, detected, now=None):
+        """Feeds one inference result; returns the new state if it changed, else None."""
+        if detected:
+            self.empty_frames = 0
+            if self.state == IDLE:
+                return self._enter(ACTIVE, now)
+            return None
+        self.empty_frames += 1
+        if self.state == ACTIVE and self.empty_frames >= self.idle_after:
+            return self._enter(IDLE, now)
+        return None
+
+    def frame_interval(self):
+        """Minimum seconds between captured frames in the current state."""
+        if self.state == IDLE and self.idle_fps > 0:
+            return 1.0 / self.idle_fps
+        return 0.0
+
+    def _enter(self, state, now=None):
+        if now is None:
+            now = time.monotonic()
+        self.durations[self.state] += now - self.state_since
+        self.state = state
+        self.state_since = now
+        self.transitions += 1
+        return state
+
+    def time_in_states(self, now=None):
+        """Seconds spent in each state, including the current one."""
+        if now is None:
+            now = time.monotonic()
+        durations = dict(self.durations)
+        durations[self.state] += now - self.state_since
+        return durations
+
+    def format_summary(self):
+        durations = self.time_in_states()
+        total = sum(durations.values()) or 1.0
+        return "\n".join(
+            f"{state:<16}{seconds:>8.1f} s ({100.0 * seconds / total:.0f}%)"
+            for state, seconds in durations.items()
+        )
+
+    def reset(self):
+        self.state = ACTIVE
+        self.empty_frames = 0
+        self.state_since = time.monotonic()
+        self.durations = {ACTIVE: 0.0, IDLE: 0.0}
+        self.transitions = 0
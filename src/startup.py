@@ -0,0 +1,43 @@
+import time
+
+
+class StartupTimer:
+    """
+    Records when startup milestones are reached, in seconds since this module
+    was first imported (the top of main.py). Marks may come from any thread.
+    With verbose set each mark is printed as it happens. For a per-module
+    breakdown of the import times, run python -X importtime main.py.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.marks = []
+        self.verbose = False
+
+    def mark(self, name):
+        elapsed = time.perf_counter() - self.start
+        self.marks.append((name, elapsed))
+        if self.verbose:
+            print(f"Startup: {name} after {elapsed * 1000:.0f} ms")
+        return elapsed
+
+    def elapsed(self, name):
+        """Time of the first mark called name, or None."""
+        for mark, elapsed in self.marks:
+            if mark == name:
+                return elapsed
+        return None
+
+    def summary(self):
+        return {name: round(elapsed, 3) for name, elapsed in sorted(self.marks, key=lambda m: m[1])}
+
+    def format_summary(self):
+        lines = [f"{'startup':<22}{'at ms':>9}{'step ms':>9}"]
+        previous = 0.0
+        for name, elapsed in sorted(self.marks, key=lambda m: m[1]):
+            lines.append(f"{name:<22}{elapsed * 1000:>9.0f}{(elapsed - previous) * 1000:>9.0f}")
+            previous = elapsed
+        return "\n".join(lines)
+
+
+STARTUP = StartupTimer()
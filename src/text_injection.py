@@ -0,0 +1,94 @@
+import queue
+import sys
+import threading
+import time
+
+# Paste shortcut of the platform's text fields
+PASTE_KEYS = ("command", "v") if sys.platform == "darwin" else ("ctrl", "v")
+
+
+class TextInjector:
+    """
+    Output queue for voice actions. type_text() and run() return at once; a
+    worker thread performs the actions in submission order, so commands and
+    dictation keep their order without blocking recognition.
+
+    Text is sent in one operation: as a single batch of key events on
+    backends with bulk typing (XTest), otherwise by pasting it through the
+    clipboard, whose previous text is restored afterwards. Typing it
+    character by character is the fallback when neither works. strategy
+    forces "type" or "paste"; "auto" picks per string.
+    """
+
+    def __init__(self, backend, strategy="auto", paste_keys=PASTE_KEYS, restore_delay=0.15):
+        self.backend = backend
+        self.strategy = strategy
+        self.paste_keys = paste_keys
+        # Time for the target application to read the clipboard before it is restored
+        self.restore_delay = restore_delay
+        try:
+            import pyperclip
+            self.clipboard = pyperclip
+        except ImportError:
+            self.clipboard = None
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="text-injection", daemon=True)
+        self.thread.start()
+
+    def type_text(self, text):
+        if text:
+            self.queue.put((self._inject, (text,)))
+
+    def run(self, fn, *args):
+        """Queues fn(*args) behind the pending output."""
+        self.queue.put((fn, args))
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            fn, args = item
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"Output error: {e}")
+
+    def _inject(self, text):
+        strategy = self.strategy
+        if strategy == "auto":
+            if self.backend.bulk_typing and self.backend.can_type(text):
+                strategy = "type"
+            else:
+                strategy = "paste"
+        if strategy == "paste" and self._paste(text):
+            return
+        self.backend.typewrite(text)
+
+    def _paste(self, text):
+        if self.clipboard is None:
+            return False
+        try:
+            previous = self.clipboard.paste()
+            self.clipboard.copy(text)
+        except Exception as e:
+            # No clipboard mechanism available (e.g. xclip missing)
+            print(f"Clipboard unavailable, typing instead: {e}")
+            self.clipboard = None
+            return False
+        try:
+            self.backend.hotkey(*self.paste_keys)
+        except Exception as e:
+            print(f"Paste failed, typing instead: {e}")
+            self.clipboard.copy(previous)
+            return False
+        time.sleep(self.restore_delay)
+        try:
+            self.clipboard.copy(previous)
+        except Exception as e:
+            print(f"Could not restore clipboard: {e}")
+        return True
+
+    def close(self, timeout=2.0):
+        self.queue.put(None)
+        self.thread.join(timeout)
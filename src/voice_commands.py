@@ -0,0 +1,80 @@
+COMMANDS = ("enter", "click", "scroll up", "scroll down")
+
+
+class CommandGrammar:
+    """Word-level prefix trie over the command phrases."""
+
+    def __init__(self, phrases=COMMANDS):
+        self.root = {}
+        for phrase in phrases:
+            node = self.root
+            for word in phrase.split():
+                node = node.setdefault(word, {})
+            node[None] = phrase
+
+    def match(self, words):
+        """
+        Looks for a command at the start of words. Returns (command, end,
+        open): the longest complete phrase (or None), the index just past
+        it, and whether all the words are still a prefix of some longer
+        phrase, so more words could change the result.
+        """
+        node = self.root
+        command, end = None, 0
+        for i in range(len(words)):
+            node = node.get(words[i])
+            if node is None:
+                return command, end, False
+            if None in node:
+                command, end = node[None], i + 1
+        return command, end, len(node) > (None in node)
+
+    def exact(self, words, final=True):
+        """
+        Returns the command that words form on their own, or None. With
+        final False, a command that more words could still extend also
+        returns None.
+        """
+        command, end, open_ = self.match(words)
+        if command is None or end != len(words) or (open_ and not final):
+            return None
+        return command
+
+
+class CommandStream:
+    """
+    Turns the growing hypotheses of one utterance into a command or
+    dictation. Like a single recognized phrase, an utterance runs a command
+    only if it is exactly that command; anything else is dictated whole.
+    A partial hypothesis that is already exactly a command, and can't grow
+    into a longer one, fires right away. If the recognizer then extends or
+    revises the utterance, the command has run and the final text is
+    dictated.
+    """
+
+    def __init__(self, grammar):
+        self.grammar = grammar
+        self.reset()
+
+    def reset(self):
+        self.fired = None
+
+    def partial(self, text):
+        """Returns the commands that can fire on a partial hypothesis."""
+        if self.fired is not None:
+            return []
+        command = self.grammar.exact(text.lower().split(), final=False)
+        if command is None:
+            return []
+        self.fired = command
+        return [command]
+
+    def final(self, text):
+        """Returns (commands, dictation) for the finished utterance and resets."""
+        words = text.split()
+        command = self.grammar.exact([word.lower() for word in words])
+        fired = self.fired
+        self.reset()
+        if command is not None:
+            return ([] if command == fired else [command]), ""
+        return [], " ".join(words)
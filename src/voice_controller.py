@@ -1,76 +1,316 @@
 import speech_recognition as sr
+import queue
 import threading
-import pyautogui
+from src.input_backend import create_backend
+from src.text_injection import TextInjector
+from src.voice_commands import CommandGrammar, CommandStream
+from src.offline_recognizer import VoskRecognizer
+
+ENGINES = ("google", "vosk")
 
 class VoiceController:
-    def __init__(self):
+    """
+    With the google engine, audio capture runs on speech_recognition's
+    background listener thread and only hands phrases off. Recognition
+    happens on a pool of recognition_workers threads fed through a queue
+    holding at most max_pending phrases (the oldest is dropped when it is
+    full), and commands are executed in phrase order on a separate dispatch
+    thread. Every thread blocks on a queue while idle, so listening costs
+    no CPU between phrases.
+
+    The vosk engine recognizes offline from the Vosk model at model_path,
+    streaming microphone audio through it on one capture thread. A phrase
+    that is exactly a command fires from the partial results, without
+    waiting for the end of the phrase.
+
+    Commands and dictation are injected through backend by a TextInjector,
+    off the dispatch thread. The microphone is opened by the first
+    listen_and_execute(). stop() returns at once; the threads shut down in
+    the background, and the next session only starts capturing once they
+    have released the microphone.
+    """
+
+    def __init__(self, recognition_workers=2, max_pending=4, engine="google", model_path=None,
+                 backend=None, text_strategy="auto"):
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown voice engine: {engine}")
+        self.engine = engine
+        self.model_path = model_path
+        self.offline = None
+        self.grammar = CommandGrammar()
+        self.backend = backend if backend is not None else create_backend()
+        self.output = TextInjector(self.backend, strategy=text_strategy)
         self.recognizer = sr.Recognizer()
         self.microphone = None
         self.listening = False
-        self.thread = None
+        self.recognition_workers = recognition_workers
+        self.max_pending = max_pending
+        self.audio_queue = None
+        self.text_queue = None
+        self.threads = []
+        self.capture_threads = []
+        self.stop_listening = None
+        # Set once the previous session has let go of the microphone
+        self.microphone_free = threading.Event()
+        self.microphone_free.set()
+        self.stopping = None
+        # Counts listening sessions, so threads of a stopped one stand down
+        self.generation = 0
+        self.lock = threading.Lock()
+        self.seq = 0
+        self.dropped = 0
         self.last_text = ""
-        try:
-            self.microphone = sr.Microphone()
-        except OSError as e:
-            print(f"Microphone error: {e}")
-            self.microphone = None
+
+    def _next_seq(self):
+        with self.lock:
+            if not self.listening:
+                return None
+            seq = self.seq
+            self.seq += 1
+            return seq
 
     def _callback(self, recognizer, audio):
+        # Runs on the capture thread; must return quickly
+        seq = self._next_seq()
+        if seq is None:
+            return
+        audio_queue = self.audio_queue
+        while True:
+            try:
+                audio_queue.put_nowait((seq, audio))
+                return
+            except queue.Full:
+                pass
+            try:
+                dropped = audio_queue.get_nowait()
+            except queue.Empty:
+                continue
+            if dropped is None:
+                # A shutdown sentinel: put it back for its worker, drop this phrase
+                audio_queue.put_nowait(None)
+                return
+            dropped_seq, _ = dropped
+            self.dropped += 1
+            # Tell the dispatcher not to wait for the dropped phrase
+            self.text_queue.put((dropped_seq, "text", None))
+            print("Voice: recognition is falling behind, dropped a phrase.")
+
+    def _recognize_loop(self, audio_queue, text_queue):
+        while True:
+            item = audio_queue.get()
+            if item is None:
+                break
+            seq, audio = item
+            text = None
+            try:
+                text = self.recognizer.recognize_google(audio)
+                print(f"Voice input: {text}")
+            except sr.UnknownValueError:
+                print("Could not understand audio.")
+            except sr.RequestError as e:
+                print(f"Speech recognition error: {e}")
+            text_queue.put((seq, "text", text))
+
+    def _dispatch_loop(self, text_queue):
+        # Workers finish out of order; commands run in the order they were spoken
+        next_seq = 0
+        pending = {}
+        while True:
+            item = text_queue.get()
+            if item is None:
+                break
+            seq, kind, value = item
+            pending[seq] = (kind, value)
+            while next_seq in pending:
+                kind, value = pending.pop(next_seq)
+                next_seq += 1
+                if not value or not self.listening:
+                    continue
+                if kind == "command":
+                    self.run_command(value)
+                elif kind == "dictate":
+                    self.dictate(value)
+                else:
+                    self.last_text = value
+                    self.handle_command(value)
+
+    def _active(self, generation):
+        return self.listening and self.generation == generation
+
+    def _stream_loop(self, text_queue, generation, microphone_free):
+        microphone_free.wait()
+        if not self._active(generation):
+            return
         try:
-            text = recognizer.recognize_google(audio)
-            print(f"Voice input: {text}")
-            self.last_text = text
-            self.handle_command(text)
-        except sr.UnknownValueError:
-            print("Could not understand audio.")
-        except sr.RequestError as e:
-            print(f"Speech recognition error: {e}")
+            if self.offline is None:
+                # Loading a model takes seconds, so it is kept for later starts
+                self.offline = VoskRecognizer(self.model_path, self.microphone.SAMPLE_RATE)
+            self._stream(text_queue, generation)
+        except Exception as e:
+            print(f"Offline recognition stopped: {e}")
+            # Don't leave the controller looking like it still listens
+            if self._active(generation):
+                self.stop()
+
+    def _stream(self, text_queue, generation):
+        offline = self.offline
+        offline.reset()
+        stream = CommandStream(self.grammar)
+        with self.microphone as source:
+            while self._active(generation):
+                # Blocks until a chunk of audio has been recorded
+                event = offline.accept(source.stream.read(source.CHUNK))
+                if event is None:
+                    continue
+                kind, text = event
+                dictation = None
+                if kind == "partial":
+                    commands = stream.partial(text)
+                else:
+                    commands, dictation = stream.final(text)
+                    if text:
+                        print(f"Voice input: {text}")
+                        self.last_text = text
+                for command in commands:
+                    self._emit(text_queue, "command", command)
+                if dictation:
+                    self._emit(text_queue, "dictate", dictation)
+
+    def _emit(self, text_queue, kind, value):
+        seq = self._next_seq()
+        if seq is not None:
+            text_queue.put((seq, kind, value))
+
+    def _start_capture(self, generation, microphone_free):
+        microphone_free.wait()
+        if not self._active(generation):
+            return
+        with self.microphone as source:
+            self.recognizer.adjust_for_ambient_noise(source)
+        with self.lock:
+            if not self._active(generation):
+                return
+            self.stop_listening = self.recognizer.listen_in_background(
+                self.microphone, self._callback
+            )
 
     def listen_and_execute(self):
+        if self.microphone is None:
+            # Opened on first use, so the microphone is untouched until voice control is enabled
+            try:
+                self.microphone = sr.Microphone()
+            except OSError as e:
+                print(f"Microphone error: {e}")
         if not self.microphone:
             print("No microphone available.")
             return
         if self.listening:
             print("Already listening.")
             return
-        self.listening = True
+        with self.lock:
+            self.listening = True
+            self.generation += 1
+            self.seq = 0
+            self.audio_queue = queue.Queue(maxsize=self.max_pending)
+            self.text_queue = queue.Queue()
+            # Capture waits for the microphone to be released by the last stop()
+            capture_args = (self.generation, self.microphone_free)
         print("VoiceController: Listening for voice commands...")
-        self.thread = threading.Thread(target=self._background_listen)
-        self.thread.daemon = True
-        self.thread.start()
-
-    def _background_listen(self):
-        with self.microphone as source:
-            self.recognizer.adjust_for_ambient_noise(source)
-        stop_listening = self.recognizer.listen_in_background(
-            self.microphone, self._callback
-        )
-        try:
-            while self.listening:
-                pass  # Keep thread alive
-        except KeyboardInterrupt:
-            stop_listening(wait_for_stop=False)
-            print("VoiceController: Stopped listening.")
+        self.threads = [
+            threading.Thread(target=self._dispatch_loop, args=(self.text_queue,), name="voice-dispatch", daemon=True)
+        ]
+        if self.engine == "vosk":
+            self.capture_threads = [
+                threading.Thread(target=self._stream_loop, args=(self.text_queue,) + capture_args,
+                                 name="voice-stream", daemon=True)
+            ]
+        else:
+            self.threads.extend(
+                threading.Thread(target=self._recognize_loop, args=(self.audio_queue, self.text_queue),
+                                 name=f"voice-recognize-{i}", daemon=True)
+                for i in range(self.recognition_workers)
+            )
+            # Ambient noise calibration blocks for about a second
+            self.capture_threads = [
+                threading.Thread(target=self._start_capture, args=capture_args, name="voice-calibrate", daemon=True)
+            ]
+        for thread in self.threads + self.capture_threads:
+            thread.start()
 
     def handle_command(self, text):
-        cmd = text.lower().strip()
+        """Runs the utterance as a command if it is exactly one; otherwise types it."""
+        commands, dictation = CommandStream(self.grammar).final(text.strip())
+        for command in commands:
+            self.run_command(command)
+        if dictation:
+            self.dictate(dictation)
+
+    def run_command(self, cmd):
         if cmd == "enter":
-            pyautogui.press("enter")
+            self.output.run(self.backend.press, "enter")
             print("[Voice] Enter key pressed.")
         elif cmd == "click":
-            pyautogui.click()
+            self.output.run(self.backend.click)
             print("[Voice] Mouse click.")
         elif cmd == "scroll up":
-            pyautogui.scroll(300)
+            self.output.run(self.backend.scroll, 300)
             print("[Voice] Scrolled up.")
         elif cmd == "scroll down":
-            pyautogui.scroll(-300)
+            self.output.run(self.backend.scroll, -300)
             print("[Voice] Scrolled down.")
-        else:
-            # Dictation: type the text
-            pyautogui.typewrite(text + " ")
-            print(f"[Voice] Dictated: {text}")
+
+    def dictate(self, text):
+        # Dictation: type the text
+        self.output.type_text(text + " ")
+        print(f"[Voice] Dictated: {text}")
 
     def stop(self):
-        self.listening = False
-        print("VoiceController: Listening stopped.") 
\ No newline at end of file
+        """Stops listening without waiting for the threads to exit."""
+        with self.lock:
+            if not self.listening:
+                return
+            self.listening = False
+            microphone_free = self.microphone_free = threading.Event()
+        self.stopping = threading.Thread(
+            target=self._shut_down,
+            args=(self.capture_threads, self.threads, self.audio_queue, self.text_queue, microphone_free),
+            name="voice-stop", daemon=True
+        )
+        self.capture_threads = []
+        self.threads = []
+        self.stopping.start()
+        print("VoiceController: Listening stopped.")
+
+    def _shut_down(self, capture_threads, threads, audio_queue, text_queue, microphone_free):
+        try:
+            for thread in capture_threads:
+                # Calibration or a Vosk chunk read ends within about a second
+                thread.join()
+            # Calibration has finished, so the listener handle can't change any more
+            with self.lock:
+                stop_listening = self.stop_listening
+                self.stop_listening = None
+            if stop_listening is not None:
+                # Joins the listener thread, which holds the microphone
+                stop_listening(wait_for_stop=True)
+        finally:
+            microphone_free.set()
+        # Phrases already queued are discarded, not executed
+        while True:
+            try:
+                audio_queue.get_nowait()
+            except queue.Empty:
+                break
+        if self.engine == "google":
+            for _ in range(self.recognition_workers):
+                audio_queue.put(None)
+        text_queue.put(None)
+        for thread in threads:
+            # A worker may be mid-request; it exits once that returns
+            thread.join(timeout=5.0)
+
+    def close(self):
+        self.stop()
+        if self.stopping is not None:
+            self.stopping.join(timeout=2.0)
+        self.output.close()
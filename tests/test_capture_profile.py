@@ -0,0 +1,46 @@
+import cv2
+from src import capture_profile
+from src.capture_profile import CaptureProfile, apply_profile, resolve_profile
+
+
+def test_probe_result_is_returned_for_caching(monkeypatch):
+    profile = CaptureProfile(640, 480, "MJPG", 30, measured_fps=30.0)
+    monkeypatch.setattr(capture_profile, "probe_camera", lambda index, resolutions: profile)
+    found, entry = resolve_profile({}, 0, 640, 480)
+    assert found is profile
+    key, value = entry
+    assert value == profile.to_dict()
+    cached, entry = resolve_profile({key: value}, 0, 640, 480)
+    assert entry is None
+    assert cached.to_dict() == profile.to_dict()
+
+
+def test_failed_probe_is_cached(monkeypatch):
+    probes = []
+    monkeypatch.setattr(capture_profile, "probe_camera", lambda index, resolutions: probes.append(index))
+    found, entry = resolve_profile({}, 0, 640, 480)
+    assert found is None
+    assert entry[1] is None
+    assert resolve_profile(dict([entry]), 0, 640, 480) == (None, None)
+    assert len(probes) == 1
+
+
+class FakeCapture:
+    def __init__(self):
+        self.props = {}
+
+    def set(self, prop, value):
+        self.props[prop] = value
+
+
+def test_apply_profile_leaves_unset_format_and_rate_alone():
+    cap = FakeCapture()
+    apply_profile(cap, CaptureProfile(640, 480, None, None))
+    assert cap.props[cv2.CAP_PROP_FRAME_WIDTH] == 640
+    assert cap.props[cv2.CAP_PROP_FRAME_HEIGHT] == 480
+    assert cv2.CAP_PROP_FOURCC not in cap.props
+    assert cv2.CAP_PROP_FPS not in cap.props
+    cap = FakeCapture()
+    apply_profile(cap, CaptureProfile(1280, 720, "MJPG", 60))
+    assert cap.props[cv2.CAP_PROP_FOURCC] == cv2.VideoWriter_fourcc(*"MJPG")
+    assert cap.props[cv2.CAP_PROP_FPS] == 60
@@ -0,0 +1,114 @@
+import json
+import os
+import stat
+import time
+import pytest
+from src.config_store import ConfigStore, Option, apply_live_options, validate_config
+from src.gesture_controller import GestureController
+from src.input_backend import RecordingBackend
+
+
+def wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "config.json")
+
+
+def test_defaults_without_file(path):
+    store = ConfigStore(path)
+    try:
+        assert store['sensitivity'] == 1.0
+        assert 'sensitivity' not in store
+        assert store.get('unknown', 5) == 5
+    finally:
+        store.close()
+    assert not os.path.exists(path)
+
+
+def test_round_trip(path):
+    store = ConfigStore(path, save_delay=0.01)
+    store['sensitivity'] = 1.5
+    store['filter_type'] = "kalman"
+    store.close()
+    with open(path) as f:
+        assert json.load(f) == {"sensitivity": 1.5, "filter_type": "kalman"}
+    store = ConfigStore(path)
+    try:
+        assert store['sensitivity'] == 1.5
+        assert store['filter_type'] == "kalman"
+    finally:
+        store.close()
+
+
+def test_set_validates(path):
+    store = ConfigStore(path)
+    try:
+        with pytest.raises(ValueError):
+            store['filter_type'] = "bogus"
+        store['sensitivity'] = 2
+        assert store['sensitivity'] == 2.0
+    finally:
+        store.close()
+
+
+def test_invalid_values_in_file_fall_back_to_defaults(path):
+    with open(path, 'w') as f:
+        json.dump({"filter_type": "bogus", "smoothing_window": "5", "custom": [1]}, f)
+    store = ConfigStore(path)
+    try:
+        assert store['filter_type'] == "one_euro"
+        assert store['smoothing_window'] == 5
+        assert store['custom'] == [1]
+    finally:
+        store.close()
+
+
+def test_external_edit_is_reloaded(path):
+    with open(path, 'w') as f:
+        json.dump({"sensitivity": 1.0}, f)
+    store = ConfigStore(path, poll_interval=0.05)
+    changes = []
+    store.add_listener(changes.append)
+    try:
+        with open(path, 'w') as f:
+            json.dump({"sensitivity": 2.5}, f)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert wait_for(lambda: changes)
+        assert changes[0] == {"sensitivity": 2.5}
+        assert store['sensitivity'] == 2.5
+    finally:
+        store.close()
+
+
+def test_validate_config_options():
+    schema = {"mode": Option("a", str, choices=("a", "b")), "size": Option(None, int, nullable=True)}
+    assert validate_config({"mode": "b", "size": None}, schema) == {"mode": "b", "size": None}
+    assert validate_config({"mode": "c", "size": True}, schema) == {}
+
+
+def test_save_keeps_file_permissions(path):
+    with open(path, 'w') as f:
+        json.dump({}, f)
+    os.chmod(path, 0o644)
+    store = ConfigStore(path, save_delay=0.01)
+    store['sensitivity'] = 1.5
+    store.close()
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+
+
+def test_apply_live_options_reports_restart_keys():
+    controller = GestureController(backend=RecordingBackend())
+    changed = {"sensitivity": 1.7, "max_num_hands": 1, "kinetic_scroll": False, "preview_fps": 15.0,
+               "preview_enabled": False, "custom": 1}
+    restart = apply_live_options(changed, [controller])
+    assert controller.sensitivity == 1.7
+    assert sorted(restart) == ["kinetic_scroll", "max_num_hands", "preview_fps"]
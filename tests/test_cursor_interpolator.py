@@ -0,0 +1,34 @@
+import math
+import pytest
+from src.cursor_interpolator import CursorInterpolator
+from src.input_backend import RecordingBackend
+
+
+def test_extrapolation_overshoot_is_bounded():
+    interpolator = CursorInterpolator(RecordingBackend(), max_extrapolation=1.0, max_overshoot=40.0)
+    interpolator.push_target(0, 0, timestamp=0.0)
+    interpolator.push_target(300, 0, timestamp=0.1)
+    for now in (0.12, 0.15, 0.2, 0.5):
+        x, y = interpolator.position(now)
+        assert math.hypot(x - 300, y) <= 40.0 + 1e-9
+    assert interpolator.position(0.5) == (340.0, 0.0)
+
+
+def test_interpolation_stays_between_targets():
+    interpolator = CursorInterpolator(RecordingBackend(), mode="interpolate")
+    interpolator.push_target(0, 0, timestamp=0.0)
+    interpolator.push_target(100, 50, timestamp=0.1)
+    interpolator.latency = 0.0
+    assert interpolator.position(0.15) == pytest.approx((50.0, 25.0))
+    assert interpolator.position(1.0) == (100.0, 50.0)
+
+
+def test_snap_moves_exactly_and_holds():
+    backend = RecordingBackend()
+    interpolator = CursorInterpolator(backend)
+    interpolator.push_target(0, 0, timestamp=0.0)
+    interpolator.push_target(300, 0, timestamp=0.1)
+    interpolator.snap(123, 456)
+    assert backend.events == [("move", 123, 456)]
+    # No extrapolation from the old motion after a snap
+    assert interpolator.position(10.0) == (123.0, 456.0)
@@ -0,0 +1,78 @@
+import math
+import random
+import pytest
+from src.filters import OneEuroFilter, ConstantVelocityKalmanFilter, MovingAverageFilter, PointFilter
+from src.gesture_controller import GestureController
+from src.input_backend import RecordingBackend
+
+
+def test_one_euro_passes_first_sample_and_holds_constant_input():
+    f = OneEuroFilter()
+    assert f.filter(100.0, 0.0) == 100.0
+    for i in range(1, 30):
+        assert f.filter(100.0, i / 30) == pytest.approx(100.0)
+
+
+def test_one_euro_smooths_jitter():
+    rng = random.Random(1)
+    f = OneEuroFilter(min_cutoff=1.0, beta=0.0)
+    outputs = [f.filter(500.0 + rng.uniform(-5, 5), i / 30) for i in range(200)]
+    assert max(abs(x - 500.0) for x in outputs[50:]) < 2.5
+
+
+def test_one_euro_ignores_repeated_timestamp():
+    f = OneEuroFilter()
+    f.filter(0.0, 0.0)
+    previous = f.filter(10.0, 1 / 30)
+    assert f.filter(1000.0, 1 / 30) == previous
+    assert f.filter(1000.0, 0.0) == previous
+
+
+def test_one_euro_reset():
+    f = OneEuroFilter()
+    f.filter(0.0, 0.0)
+    f.filter(50.0, 1 / 30)
+    f.reset()
+    assert f.filter(200.0, 2 / 30) == 200.0
+
+
+def test_kalman_converges_on_constant_input():
+    f = ConstantVelocityKalmanFilter()
+    for i in range(100):
+        value = f.filter(300.0, i / 30)
+    assert math.isclose(value, 300.0, abs_tol=0.01)
+
+
+def test_kalman_tracks_constant_velocity():
+    f = ConstantVelocityKalmanFilter()
+    for i in range(100):
+        t = i / 30
+        value = f.filter(600.0 * t, t)
+    assert abs(value - 600.0 * 99 / 30) < 1.0
+    assert abs(f.v - 600.0) < 10.0
+
+
+def test_point_filter_filters_axes_independently():
+    f = PointFilter("kalman")
+    assert f.filter(10.0, 20.0, 0.0) == (10.0, 20.0)
+
+
+def test_one_euro_lags_less_than_moving_average_on_fast_motion():
+    euro = OneEuroFilter(min_cutoff=1.0, beta=0.05)
+    average = MovingAverageFilter(window=5)
+    for i in range(60):
+        t = i / 30
+        x = 1000.0 * t
+        euro_lag = x - euro.filter(x, t)
+        average_lag = x - average.filter(x, t)
+    assert 0.0 <= euro_lag < average_lag
+
+
+def test_moving_average_window():
+    f = MovingAverageFilter(window=3)
+    assert [f.filter(x, 0.0) for x in (3.0, 6.0, 9.0, 12.0)] == [3.0, 4.5, 6.0, 9.0]
+
+
+def test_unknown_filter_type_falls_back_to_one_euro():
+    controller = GestureController(backend=RecordingBackend(), filter_type="median")
+    assert controller.filter_type == "one_euro"
@@ -0,0 +1,92 @@
+import numpy as np
+from src.features import HandFeatures, NUM_LANDMARKS
+from src.hand_identity import HandAssociator, LEFT, RIGHT
+
+
+def hands_at(*centers):
+    landmarks = np.zeros((len(centers), NUM_LANDMARKS, 3), dtype=np.float32)
+    for i, (x, y) in enumerate(centers):
+        landmarks[i, :, 0] = x
+        landmarks[i, :, 1] = y
+    features = HandFeatures(max_num_hands=2)
+    return features.update(landmarks)
+
+
+def codes(*values):
+    return np.array(values, dtype=np.int8)
+
+
+def test_slots_follow_hands_when_detection_order_swaps():
+    associator = HandAssociator(2)
+    assert list(associator.assign(hands_at((0.2, 0.5), (0.8, 0.5)))) == [0, 1]
+    assert list(associator.assign(hands_at((0.81, 0.5), (0.21, 0.5)))) == [1, 0]
+    assert not associator.started.any()
+
+
+def test_new_hand_starts_a_slot():
+    associator = HandAssociator(2)
+    associator.assign(hands_at((0.2, 0.5)))
+    assert associator.started[0]
+    associator.assign(hands_at((0.2, 0.5), (0.8, 0.5)))
+    assert list(associator.started) == [False, True]
+
+
+def test_slot_is_held_while_hand_briefly_disappears():
+    associator = HandAssociator(2, max_missed=3)
+    associator.assign(hands_at((0.2, 0.5), (0.8, 0.5)))
+    for _ in range(3):
+        associator.assign(hands_at((0.2, 0.5)))
+    assert list(associator.assign(hands_at((0.2, 0.5), (0.8, 0.5)))) == [0, 1]
+    assert not associator.started[1]
+
+
+def test_remaining_hand_is_promoted_to_slot_0():
+    associator = HandAssociator(2, max_missed=1)
+    associator.assign(hands_at((0.2, 0.5), (0.8, 0.5)))
+    for _ in range(2):
+        slots = associator.assign(hands_at((0.8, 0.5)))
+    assert list(slots) == [0]
+    assert associator.started[0]
+
+
+def test_handedness_mismatch_is_penalized():
+    associator = HandAssociator(2, max_distance=0.3, handedness_penalty=0.5)
+    associator.assign(hands_at((0.4, 0.5), (0.6, 0.5)), codes(LEFT, RIGHT))
+    # Hands crossed; position alone would swap them, handedness keeps them
+    slots = associator.assign(hands_at((0.55, 0.5), (0.45, 0.5)), codes(LEFT, RIGHT))
+    assert list(slots) == [0, 1]
+
+
+
+def test_fast_moving_hand_keeps_its_slot():
+    associator = HandAssociator(2, max_distance=0.25)
+    associator.assign(hands_at((0.2, 0.5)))
+    # Moved further than max_distance in one frame
+    assert list(associator.assign(hands_at((0.55, 0.5)))) == [0]
+    assert not associator.started[0]
+
+
+def test_new_hand_far_away_does_not_take_held_slot_0():
+    associator = HandAssociator(2, max_missed=3)
+    associator.assign(hands_at((0.2, 0.5)))
+    # Pointer hand lost for a frame while another hand appears far away
+    assert list(associator.assign(hands_at((0.9, 0.5)))) == [1]
+    assert associator.active[0]
+    assert list(associator.assign(hands_at((0.21, 0.5), (0.9, 0.5)))) == [0, 1]
+    assert not associator.started[0]
+
+
+def test_preferred_hand_claims_free_slot_0():
+    associator = HandAssociator(2, preferred=RIGHT)
+    slots = associator.assign(hands_at((0.2, 0.5), (0.8, 0.5)), codes(LEFT, RIGHT))
+    assert list(slots) == [1, 0]
+    assert associator.handedness[0] == RIGHT
+
+
+def test_held_slot_taken_by_another_hand_is_started():
+    associator = HandAssociator(2)
+    associator.assign(hands_at((0.1, 0.5), (0.5, 0.5)))
+    slots = associator.assign(hands_at((0.5, 0.5), (0.95, 0.9)))
+    assert list(slots) == [1, 0]
+    # Slot 0's controller must drop the old hand's filter and pinch state
+    assert list(associator.started) == [True, False]
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from src.features import NUM_LANDMARKS
+from src.frame_sources import SyntheticSource
+from src.hand_tracker import HandTracker
+
+
+def make_tracker(inference_size=256):
+    # Process mode doesn't load MediaPipe until the first inference
+    return HandTracker(inference_mode="process", inference_size=inference_size,
+                       source=SyntheticSource((640, 480), frames=1))
+
+
+def landmarks_at(*points):
+    landmarks = np.zeros((1, NUM_LANDMARKS, 3), dtype=np.float32)
+    for i, (x, y) in enumerate(points):
+        landmarks[0, i] = (x, y, 0.1)
+    landmarks[0, len(points):] = landmarks[0, 0]
+    return landmarks
+
+
+def test_full_frame_pass_maps_back_through_padding():
+    tracker = make_tracker()
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    _, transform, roi_pass = tracker._prepare_inference_input(frame)
+    assert not roi_pass
+    landmarks = landmarks_at((0.5, 0.5))
+    tracker._map_to_frame(landmarks, transform)
+    # The 640x480 frame fills the top of the square inference image
+    assert landmarks[0, 0, :2] == pytest.approx((0.5, 320 / 480))
+    assert landmarks[0, 0, 2] == pytest.approx(0.1)
+
+
+def test_roi_pass_maps_crop_coordinates_to_frame():
+    tracker = make_tracker()
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    tracker.roi = (100, 50, 300)
+    _, transform, roi_pass = tracker._prepare_inference_input(frame)
+    assert roi_pass
+    landmarks = landmarks_at((0.0, 0.0), (1.0, 1.0))
+    tracker._map_to_frame(landmarks, transform)
+    assert landmarks[0, 0, :2] == pytest.approx((100 / 640, 50 / 480))
+    assert landmarks[0, 1, :2] == pytest.approx((400 / 640, 350 / 480))
+
+
+def test_update_roi_pads_and_clamps_to_frame():
+    tracker = make_tracker(inference_size=128)
+    tracker._update_roi(landmarks_at((0.0, 0.0), (0.2, 0.2)), (480, 640, 3))
+    x0, y0, side = tracker.roi
+    assert (x0, y0) == (0, 0)
+    # The wider side of the box, padded by roi_padding on both ends
+    assert side == int(0.2 * 640 * 1.6)
+
+
+def test_update_roi_drops_crop_for_large_or_missing_hands():
+    tracker = make_tracker()
+    tracker._update_roi(landmarks_at((0.1, 0.1), (0.9, 0.9)), (480, 640, 3))
+    assert tracker.roi is None
+    tracker.roi = (0, 0, 300)
+    tracker._update_roi(np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32), (480, 640, 3))
+    assert tracker.roi is None
@@ -0,0 +1,33 @@
+from src.input_backend import RecordingBackend
+
+
+def test_flush_injects_only_the_last_move():
+    backend = RecordingBackend()
+    backend.move_to(10, 10)
+    backend.move_to(20, 20)
+    backend.move_to(30.7, 40.2)
+    backend.flush()
+    assert backend.events == [("move", 30, 40)]
+    assert backend.coalesced_moves == 2
+
+
+def test_flush_skips_a_move_to_the_current_position():
+    backend = RecordingBackend()
+    backend.move_to(5, 5)
+    backend.flush()
+    backend.move_to(5, 5)
+    backend.flush()
+    backend.flush()
+    assert backend.events == [("move", 5, 5)]
+
+
+def test_buttons_flush_the_pending_move_first():
+    backend = RecordingBackend()
+    backend.move_to(100, 200)
+    backend.click()
+    backend.move_to(110, 200)
+    backend.scroll(3)
+    assert backend.events == [
+        ("move", 100, 200), ("down", "left"), ("up", "left"),
+        ("move", 110, 200), ("scroll", 3),
+    ]
@@ -0,0 +1,44 @@
+from src.input_backend import RecordingBackend
+from src.kinetic_scroll import KineticScroller
+
+
+def test_release_coasts_and_decays_to_rest():
+    scroller = KineticScroller(RecordingBackend(), friction=4.0, min_velocity=3.0)
+    scroller.push(10, timestamp=0.0)
+    scroller.release()
+    velocity = scroller.velocity
+    total = 0
+    for _ in range(600):
+        total += scroller._step(1 / 120)
+        assert abs(scroller.velocity) <= abs(velocity)
+        velocity = scroller.velocity
+    assert scroller.velocity == 0.0
+    assert total > 10
+
+
+def test_fractional_amounts_carry_over():
+    scroller = KineticScroller(RecordingBackend(), friction=0.0)
+    scroller.push(1, timestamp=0.0)
+    scroller.release()
+    scroller.velocity = 30.0
+    amounts = [scroller._step(1 / 120) for _ in range(120)]
+    assert sum(amounts) == 30
+    assert max(amounts) == 1
+
+
+def test_halt_stops_motion():
+    scroller = KineticScroller(RecordingBackend())
+    scroller.push(50, timestamp=0.0)
+    scroller.halt()
+    assert scroller._step(1 / 120) == 0
+
+
+def test_capture_clock_does_not_end_the_touch():
+    scroller = KineticScroller(RecordingBackend(), friction=4.0)
+    # Capture timestamps from a clock far behind time.monotonic()
+    scroller.push(10, timestamp=0.0)
+    scroller.push(10, timestamp=1 / 30)
+    velocity = scroller.velocity
+    scroller._step(1 / 120)
+    assert scroller.touching
+    assert scroller.velocity == velocity
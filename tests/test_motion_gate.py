@@ -0,0 +1,61 @@
+import numpy as np
+from src.features import NUM_LANDMARKS
+from src.motion_gate import MotionGate
+
+
+def hand_box(x0, y0, x1, y1):
+    landmarks = np.zeros((1, NUM_LANDMARKS, 3), dtype=np.float32)
+    landmarks[0, :, 0] = np.linspace(x0, x1, NUM_LANDMARKS)
+    landmarks[0, :, 1] = np.linspace(y0, y1, NUM_LANDMARKS)
+    return landmarks
+
+
+def frame_with_square(x, y):
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    frame[y:y + 40, x:x + 40] = 255
+    return frame
+
+
+def test_static_frame_is_skipped_up_to_max_skip():
+    gate = MotionGate(max_skip=2)
+    frame = frame_with_square(140, 100)
+    assert not gate.is_static(frame)
+    gate.update(frame, hand_box(0.4, 0.35, 0.6, 0.65))
+    assert gate.is_static(frame.copy())
+    assert gate.is_static(frame.copy())
+    assert not gate.is_static(frame.copy())
+    assert gate.skipped == 2
+
+
+def test_motion_in_hand_region_is_not_skipped():
+    gate = MotionGate()
+    gate.update(frame_with_square(140, 100), hand_box(0.4, 0.35, 0.6, 0.65))
+    assert not gate.is_static(frame_with_square(150, 100))
+
+
+def test_no_hand_never_skips():
+    gate = MotionGate()
+    frame = frame_with_square(140, 100)
+    gate.update(frame, np.zeros((0, NUM_LANDMARKS, 3), dtype=np.float32))
+    assert not gate.is_static(frame)
+
+
+def test_motion_outside_hand_region_is_ignored():
+    gate = MotionGate()
+    frame = frame_with_square(140, 100)
+    gate.update(frame, hand_box(0.4, 0.35, 0.6, 0.65))
+    moved = frame.copy()
+    moved[0:30, 0:30] = 255
+    assert gate.is_static(moved)
+
+
+def test_reset_and_skip_rate():
+    gate = MotionGate(max_skip=1)
+    frame = frame_with_square(140, 100)
+    gate.update(frame, hand_box(0.4, 0.35, 0.6, 0.65))
+    assert gate.is_static(frame)
+    assert not gate.is_static(frame)
+    assert gate.skip_rate == 0.5
+    gate.update(frame, hand_box(0.4, 0.35, 0.6, 0.65))
+    gate.reset()
+    assert not gate.is_static(frame)
@@ -0,0 +1,73 @@
+import threading
+import time
+import numpy as np
+from src.input_backend import RecordingBackend
+from src.pipeline import TrackingPipeline
+
+
+class StubTracker:
+    max_num_hands = 1
+    inference_size = None
+    metrics = None
+    motion_gate = None
+    last_handedness = None
+
+    def __init__(self, fail_reads=0):
+        self.fail_reads = fail_reads
+        self.reads = 0
+        self.last_capture_time = 0.0
+
+    def read_frame(self):
+        self.reads += 1
+        if self.reads <= self.fail_reads:
+            raise IOError("camera read failed")
+        time.sleep(0.005)
+        self.last_capture_time = time.monotonic()
+        return np.zeros((4, 4, 3), dtype=np.uint8)
+
+    def process_frame(self, frame):
+        return np.zeros((0, 21, 3), dtype=np.float32)
+
+    def set_inference_size(self, size):
+        self.inference_size = size
+
+
+class StubController:
+    def __init__(self):
+        self.backend = RecordingBackend()
+
+    def release_drag(self):
+        pass
+
+
+def test_stage_survives_a_single_exception():
+    errors = []
+    frames = threading.Event()
+    pipeline = TrackingPipeline(StubTracker(fail_reads=1), StubController(),
+                                on_hands=lambda detected: frames.set(), on_error=errors.append)
+    pipeline.start()
+    try:
+        assert frames.wait(2.0)
+    finally:
+        pipeline.stop()
+    assert errors == []
+    assert pipeline.error is None
+
+
+def test_persistent_failure_reports_error():
+    failed = threading.Event()
+    errors = []
+
+    def on_error(message):
+        errors.append(message)
+        failed.set()
+
+    pipeline = TrackingPipeline(StubTracker(fail_reads=10 ** 6), StubController(),
+                                on_error=on_error, max_failures=5)
+    pipeline.start()
+    try:
+        assert failed.wait(2.0)
+    finally:
+        pipeline.stop()
+    assert errors == ["capture failed: camera read failed"]
+    assert pipeline.error == errors[0]
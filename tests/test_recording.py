@@ -0,0 +1,68 @@
+import time
+import numpy as np
+import pytest
+from src.features import NUM_LANDMARKS
+from src.recording import LandmarkRecorder, LandmarkReplayer, read_session
+
+
+class CallLog:
+    def __init__(self):
+        self.calls = []
+
+    def process_hand(self, landmarks, timestamp=None):
+        self.calls.append(("hand", timestamp, float(landmarks[0, 0])))
+
+    def release_drag(self):
+        self.calls.append(("release",))
+
+
+def hands(count, value):
+    return np.full((count, NUM_LANDMARKS, 3), value, dtype=np.float32)
+
+
+def record(path):
+    with LandmarkRecorder(str(path), max_num_hands=2) as recorder:
+        recorder.write(hands(1, 0.25), 1.0)
+        recorder.write(hands(0, 0.0), 1.5)
+        recorder.write(hands(3, 0.75), 2.0)
+    return recorder
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "session.lmk"
+    assert record(path).frames == 3
+    frames = read_session(str(path))
+    assert [t for t, _ in frames] == [1.0, 1.5, 2.0]
+    assert [len(landmarks) for _, landmarks in frames] == [1, 0, 2]
+    assert frames[0][1].dtype == np.float32
+    np.testing.assert_array_equal(frames[2][1], hands(2, 0.75))
+
+
+def test_truncated_final_record_is_dropped(tmp_path):
+    path = tmp_path / "session.lmk"
+    record(path)
+    data = path.read_bytes()
+    path.write_bytes(data[:-10])
+    frames = read_session(str(path))
+    assert [t for t, _ in frames] == [1.0, 1.5]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.lmk"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        read_session(str(path))
+
+
+def test_replay_at_full_speed(tmp_path):
+    path = tmp_path / "session.lmk"
+    record(path)
+    replayer = LandmarkReplayer(str(path), speed=None)
+    controller = CallLog()
+    seen = []
+    start = time.monotonic()
+    assert replayer.play(controller, on_frame=lambda t, landmarks: seen.append(t)) == 3
+    assert controller.calls == [("hand", 1.0, 0.25), ("release",), ("hand", 2.0, 0.75)]
+    assert seen == [1.0, 1.5, 2.0]
+    # The recording spans a second; speed=None doesn't wait for it
+    assert time.monotonic() - start < 0.5
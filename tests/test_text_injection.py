@@ -0,0 +1,44 @@
+import sys
+from src.input_backend import RecordingBackend
+from src.text_injection import PASTE_KEYS, TextInjector
+
+
+class FakeClipboard:
+    def __init__(self, text=""):
+        self.text = text
+
+    def paste(self):
+        return self.text
+
+    def copy(self, text):
+        self.text = text
+
+
+class BrokenHotkeyBackend(RecordingBackend):
+    def hotkey(self, *keys):
+        raise OSError("no key events")
+
+
+def make_injector(backend):
+    injector = TextInjector(backend, strategy="paste", restore_delay=0.0)
+    injector.clipboard = FakeClipboard("previous")
+    return injector
+
+
+def test_paste_uses_the_platform_shortcut():
+    assert PASTE_KEYS[0] == ("command" if sys.platform == "darwin" else "ctrl")
+    backend = RecordingBackend()
+    injector = make_injector(backend)
+    injector._inject("hello")
+    injector.close()
+    assert backend.events == [("keydown", PASTE_KEYS[0]), ("keydown", "v"), ("keyup", "v"), ("keyup", PASTE_KEYS[0])]
+    assert injector.clipboard.text == "previous"
+
+
+def test_failed_paste_falls_back_to_typing():
+    backend = BrokenHotkeyBackend()
+    injector = make_injector(backend)
+    injector._inject("hello")
+    injector.close()
+    assert backend.events == [("type", "hello")]
+    assert injector.clipboard.text == "previous"
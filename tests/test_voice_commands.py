@@ -0,0 +1,39 @@
+from src.voice_commands import CommandGrammar, CommandStream
+
+
+def test_match_complete_command():
+    grammar = CommandGrammar()
+    assert grammar.match(["click"]) == ("click", 1, False)
+    assert grammar.match(["scroll", "down"]) == ("scroll down", 2, False)
+
+
+def test_match_prefix_is_open():
+    grammar = CommandGrammar()
+    assert grammar.match(["scroll"]) == (None, 0, True)
+
+
+def test_match_unknown_word():
+    grammar = CommandGrammar()
+    assert grammar.match(["hello", "click"]) == (None, 0, False)
+    assert grammar.match(["click", "here"]) == ("click", 1, False)
+
+
+def test_final_runs_only_exact_commands():
+    stream = CommandStream(CommandGrammar())
+    assert stream.final("Scroll Down") == (["scroll down"], "")
+    assert stream.final("enter the building") == ([], "enter the building")
+    assert stream.final("click here") == ([], "click here")
+
+
+def test_partial_fires_once_for_a_lone_command():
+    stream = CommandStream(CommandGrammar())
+    assert stream.partial("click") == ["click"]
+    assert stream.partial("click") == []
+    assert stream.final("click") == ([], "")
+
+
+def test_partial_waits_while_command_can_grow():
+    stream = CommandStream(CommandGrammar())
+    assert stream.partial("scroll") == []
+    assert stream.partial("enter the") == []
+    assert stream.final("scroll up") == (["scroll up"], "")